@@ -0,0 +1,220 @@
+"""Benchmark each day's solver against synthetic inputs of increasing scale.
+
+For every day, the runtime and peak memory of the solver are recorded against
+generated inputs at each scale, and a growth exponent is fitted to each curve
+(1.0 is linear, 2.0 quadratic, ...). The run fails if any exponent is worse
+than the stored baseline by more than the tolerance, which is widened for
+exponents fitted over fewer scales, or if either exponent can't be compared
+because one side reached fewer than two scales.
+
+Run from this directory:
+
+    python benchmark.py                     # compare every day with the baseline
+    python benchmark.py 14 23 24 19         # selected days
+    python benchmark.py --update-baseline   # record a new baseline
+"""
+import argparse
+import json
+import math
+import pathlib
+import statistics
+import sys
+import time
+from typing import Any, Optional
+
+import generators
+import runner
+
+
+BASELINE_PATH = runner.DAYS_DIR / "benchmark_baseline.json"
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+
+METRICS = ("time", "memory")
+
+
+def growth_exponent(scales: list[int], measurements: list[float]) -> Optional[float]:
+    """Slope of the log-log fit of measurements against scale."""
+    points = [
+        (math.log(scale), math.log(measurement))
+        for scale, measurement in zip(scales, measurements)
+        if measurement > 0
+    ]
+    if len(points) < 2:
+        return None
+    slope, _ = statistics.linear_regression(*zip(*points))
+    return slope
+
+
+def _log_scale_spread(scales: list[int]) -> float:
+    log_scales = [math.log(scale) for scale in scales]
+    mean = statistics.fmean(log_scales) if log_scales else 0.0
+    return sum((log_scale - mean) ** 2 for log_scale in log_scales)
+
+
+def exponent_tolerance(scales: list[int], tolerance: float) -> float:
+    """
+    ``tolerance`` for an exponent fitted over ``DEFAULT_SCALES``, widened for
+    one fitted over fewer or closer scales in line with the standard error of
+    the fit, which grows as the spread of the log scales shrinks.
+    """
+    spread = _log_scale_spread(scales)
+    if not spread:
+        return math.inf
+    return tolerance * math.sqrt(_log_scale_spread(list(DEFAULT_SCALES)) / spread)
+
+
+def benchmark_day(
+    day: int,
+    scales: tuple[int, ...] = DEFAULT_SCALES,
+    repeat: int = 3,
+    budget: float = 60.0,
+    seed: int = 2022,
+) -> dict[str, Any]:
+    """
+    Measure a day's solver at each scale, smallest first.
+
+    A scale is skipped, along with every scale after it, when the previous
+    measurement would exceed ``budget`` seconds, extrapolated along the growth
+    seen so far (or linearly, if that is slower).
+    """
+    measured: dict[str, list[Any]] = {"scales": [], "time": [], "memory": []}
+    elapsed: list[float] = []
+    for scale in sorted(scales):
+        if elapsed:
+            exponent = growth_exponent(measured["scales"], elapsed) or 1.0
+            last_scale = measured["scales"][-1]
+            if elapsed[-1] * (scale / last_scale) ** max(exponent, 1.0) > budget:
+                break
+        input_txt = generators.generate(day, scale, seed=seed)
+        start = time.perf_counter()
+        results = runner.run_day(day, input_txt, repeat=repeat)
+        elapsed.append(time.perf_counter() - start)
+
+        measured["scales"].append(scale)
+        measured["time"].append(sum(result["median"] for result in results.values()))
+        measured["memory"].append(
+            max(result["peak_memory"] for result in results.values())
+        )
+
+    return {
+        **measured,
+        **{
+            f"{metric}_exponent": growth_exponent(measured["scales"], measured[metric])
+            for metric in METRICS
+        },
+    }
+
+
+def compare_with_baseline(
+    result: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """
+    Describe every way a day's result is worse than its baseline, allowing
+    for the exponents being less certain when fitted over fewer scales.
+    """
+    regressions = []
+    allowed = exponent_tolerance(
+        min(result["scales"], baseline["scales"], key=len), tolerance
+    )
+    if len(result["scales"]) < len(baseline["scales"]):
+        regressions.append(
+            f"only reached scale {max(result['scales'], default=0)}"
+            f" within budget (baseline: {max(baseline['scales'])})"
+        )
+    for metric in METRICS:
+        exponent = result[f"{metric}_exponent"]
+        baseline_exponent = baseline[f"{metric}_exponent"]
+        if baseline_exponent is None:
+            regressions.append(f"no {metric} growth in the baseline to compare with")
+        elif exponent is None:
+            regressions.append(f"{metric} growth not measured")
+        elif exponent > baseline_exponent + allowed:
+            regressions.append(
+                f"{metric} grows as scale^{exponent:.2f}"
+                f" (baseline: scale^{baseline_exponent:.2f})"
+            )
+    return regressions
+
+
+def _format_exponent(exponent: Optional[float]) -> str:
+    return "n/a" if exponent is None else f"{exponent:.2f}"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "days", nargs="*", type=int, help="days to benchmark (default: all)"
+    )
+    parser.add_argument(
+        "--scales", nargs="+", type=int, default=DEFAULT_SCALES, help="input scales"
+    )
+    parser.add_argument(
+        "-n", "--repeat", type=int, default=3, help="repetitions per scale"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=60.0,
+        help="seconds a single scale may be expected to take before stopping",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed increase in growth exponent over the baseline, for exponents"
+        " fitted over the default scales",
+    )
+    parser.add_argument("--seed", type=int, default=2022)
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store these results as the new baseline",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failed = False
+    days = args.days or sorted(generators.GENERATORS)
+    for day in days:
+        result = benchmark_day(
+            day,
+            scales=tuple(args.scales),
+            repeat=args.repeat,
+            budget=args.budget,
+            seed=args.seed,
+        )
+        summary = (
+            f"Day {day:02}: scales {result['scales']}"
+            f" | time ~ scale^{_format_exponent(result['time_exponent'])}"
+            f" | memory ~ scale^{_format_exponent(result['memory_exponent'])}"
+        )
+        if args.update_baseline:
+            baseline[str(day)] = result
+        elif str(day) in baseline:
+            regressions = compare_with_baseline(
+                result, baseline[str(day)], args.tolerance
+            )
+            if regressions:
+                failed = True
+                summary += " | REGRESSION: " + "; ".join(regressions)
+        else:
+            failed = True
+            summary += " | no baseline"
+        print(summary, flush=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,156 @@
+import heapq
+import os
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+ZERO = ord("0")
+
+
 class CalorieCounting:
-    def __init__(self, inventory_input: str):
-        raw_inventory = [
-            [int(item) for item in elf_items.split("\n")]
-            for elf_items in inventory_input.strip().split("\n\n")
-        ]
+    def __init__(self, inventory_input: str | Iterable[str], top_k: int = 3):
+        """
+        Keep the calories of the ``top_k`` elves carrying the most calories.
+
+        The inventory may be given as a string or as any iterable of lines,
+        such as an open file, which is read one elf at a time.
+        """
+        if isinstance(inventory_input, str):
+            inventory_input = inventory_input.splitlines()
+        self._top_k = top_k
         self._inventory = sorted(
-            [sum(elf_inventory) for elf_inventory in raw_inventory], reverse=True
+            heapq.nlargest(top_k, self._elf_totals(inventory_input)), reverse=True
         )
 
+    @staticmethod
+    def _elf_totals(lines: Iterable[str]) -> Iterator[int]:
+        total = None
+        for line in lines:
+            line = line.strip()
+            if line:
+                total = (total or 0) + int(line)
+            elif total is not None:
+                yield total
+                total = None
+        if total is not None:
+            yield total
+
     @classmethod
-    def read_file(cls) -> "CalorieCounting":
+    def read_file(cls, top_k: int = 3) -> "CalorieCounting":
         with open("input.txt") as f:
-            return cls(f.read())
+            return cls(f, top_k)
+
+    def calculate_calories_of_elf_carrying_most_calories(self) -> int:
+        return self._inventory[0]
+
+    def calculate_calories_of_top_three_elves_carrying_most_calories(
+        self, k: int = 3
+    ) -> int:
+        if k > self._top_k:
+            raise ValueError(f"Only the top {self._top_k} elves were kept")
+        return sum(self._inventory[:k])
+
+
+class MappedCalorieCounting:
+    def __init__(
+        self,
+        path: str | os.PathLike = "input.txt",
+        top_k: int = 3,
+        chunk_size: int = 1 << 26,
+    ):
+        """
+        Same as ``CalorieCounting`` but reads the inventory file through a
+        memory map and parses each chunk of ``chunk_size`` bytes with NumPy,
+        so the file never has to fit in memory.
+        """
+        self._top_k = top_k
+        top = np.empty(0, dtype=np.int64)
+        carry: Optional[int] = None
+        for chunk in self._chunks(path, chunk_size):
+            elf_totals, starts_with_blank, ends_with_blank = self._elf_totals(chunk)
+            if carry is not None:
+                # the carried elf is finished if the chunk starts with a blank
+                # line, and comes before any elf in the chunk either way
+                if starts_with_blank or not elf_totals.size:
+                    elf_totals = np.insert(elf_totals, 0, carry)
+                else:
+                    elf_totals[0] += carry
+                carry = None
+            if not ends_with_blank and elf_totals.size:
+                carry = int(elf_totals[-1])
+                elf_totals = elf_totals[:-1]
+            top = self._top(np.concatenate((top, elf_totals)))
+        if carry is not None:
+            top = self._top(np.append(top, carry))
+        self._inventory = sorted(top.tolist(), reverse=True)
+
+    @staticmethod
+    def _chunks(
+        path: str | os.PathLike, chunk_size: int
+    ) -> Iterator[npt.NDArray[np.uint8]]:
+        """Yield the file in pieces of whole lines, each ending in a newline."""
+        if not os.path.getsize(path):
+            return
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        start = 0
+        while start < data.size:
+            chunk = data[start : start + chunk_size]
+            if start + chunk.size < data.size:
+                newlines = np.flatnonzero(chunk == NEWLINE)
+                if not newlines.size:
+                    raise ValueError("Line longer than chunk size")
+                chunk = chunk[: newlines[-1] + 1]
+            elif chunk[-1] != NEWLINE:
+                chunk = np.append(chunk, np.uint8(NEWLINE))
+            start += chunk.size
+            yield chunk
+
+    @staticmethod
+    def _elf_totals(
+        chunk: npt.NDArray[np.uint8],
+    ) -> tuple[npt.NDArray[np.int64], bool, bool]:
+        """
+        Totals of the elves in a chunk of whole lines, and whether the chunk
+        starts and ends with a blank line (so its first and last elves are
+        complete).
+        """
+        chunk = chunk[chunk != CARRIAGE_RETURN]
+        newlines = np.flatnonzero(chunk == NEWLINE)
+        line_starts = np.concatenate(([0], newlines[:-1] + 1))
+        line_lengths = newlines - line_starts
+
+        # add up the digits of every line, one place value at a time
+        numbers = np.zeros(newlines.size, dtype=np.int64)
+        for place in range(line_lengths.max(initial=0)):
+            has_place = line_lengths > place
+            digits = chunk[newlines[has_place] - place - 1].astype(np.int64) - ZERO
+            numbers[has_place] += digits * 10**place
+
+        blank = line_lengths == 0
+        elf_ids = np.cumsum(blank)[~blank]
+        if not elf_ids.size:
+            return np.empty(0, dtype=np.int64), bool(blank[0]), bool(blank[-1])
+        elf_starts = np.flatnonzero(np.diff(elf_ids, prepend=-1))
+        elf_totals = np.add.reduceat(numbers[~blank], elf_starts)
+        return elf_totals, bool(blank[0]), bool(blank[-1])
+
+    def _top(self, elf_totals: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        if elf_totals.size <= self._top_k:
+            return elf_totals
+        return np.partition(elf_totals, -self._top_k)[-self._top_k :]
 
     def calculate_calories_of_elf_carrying_most_calories(self) -> int:
         return self._inventory[0]
 
-    def calculate_calories_of_top_three_elves_carrying_most_calories(self) -> int:
-        return sum(self._inventory[:3])
+    def calculate_calories_of_top_three_elves_carrying_most_calories(
+        self, k: int = 3
+    ) -> int:
+        if k > self._top_k:
+            raise ValueError(f"Only the top {self._top_k} elves were kept")
+        return sum(self._inventory[:k])
 
 
 def main() -> None:
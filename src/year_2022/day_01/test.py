@@ -1,3 +1,7 @@
+import random
+
+import pytest
+
 from day_01 import process
 
 
@@ -41,3 +45,59 @@ def test_calories_of_top_three_elves_carrying_most_calories() -> None:
 """
     cc = process.CalorieCounting(inventory_input)
     assert cc.calculate_calories_of_top_three_elves_carrying_most_calories() == 45_000
+
+
+def test_calories_of_top_k_elves_from_lines() -> None:
+    inventory_lines = iter(
+        ["1000\n", "2000\n", "3000\n", "\n", "4000\n", "\n", "5000\n", "6000\n"]
+        + ["\n", "7000\n", "8000\n", "9000\n", "\n", "10000\n"]
+    )
+    cc = process.CalorieCounting(inventory_lines, top_k=5)
+    assert cc.calculate_calories_of_elf_carrying_most_calories() == 24_000
+    assert cc.calculate_calories_of_top_three_elves_carrying_most_calories(2) == 35_000
+    assert cc.calculate_calories_of_top_three_elves_carrying_most_calories(5) == 55_000
+
+
+def test_calories_of_top_k_elves_beyond_kept() -> None:
+    cc = process.CalorieCounting("1000\n\n2000\n", top_k=1)
+    with pytest.raises(ValueError):
+        cc.calculate_calories_of_top_three_elves_carrying_most_calories(2)
+
+
+@pytest.mark.parametrize("chunk_size", [6, 16, 1 << 26])
+def test_mapped_calorie_counting(tmp_path, chunk_size: int) -> None:
+    inventory_input = """\
+1000
+2000
+3000
+
+4000
+
+5000
+6000
+
+7000
+8000
+9000
+
+10000"""
+    path = tmp_path / "input.txt"
+    path.write_text(inventory_input)
+    cc = process.MappedCalorieCounting(path, top_k=5, chunk_size=chunk_size)
+    assert cc.calculate_calories_of_elf_carrying_most_calories() == 24_000
+    assert cc.calculate_calories_of_top_three_elves_carrying_most_calories() == 45_000
+    assert cc.calculate_calories_of_top_three_elves_carrying_most_calories(5) == 55_000
+
+
+@pytest.mark.parametrize("chunk_size", range(3, 20))
+def test_mapped_calorie_counting_matches_streaming(tmp_path, chunk_size: int) -> None:
+    rng = random.Random(chunk_size)
+    inventory_input = "\n\n".join(
+        "\n".join(str(rng.randint(1, 99)) for _ in range(rng.randint(1, 4)))
+        for _ in range(50)
+    )
+    path = tmp_path / "input.txt"
+    path.write_text(inventory_input)
+    cc = process.MappedCalorieCounting(path, top_k=50, chunk_size=chunk_size)
+    expected = process.CalorieCounting(inventory_input, top_k=50)
+    assert cc._inventory == expected._inventory
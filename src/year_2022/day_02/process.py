@@ -1,7 +1,11 @@
 import enum
 import dataclasses
+import functools
 import itertools
-from typing import Literal
+from typing import Iterable, Literal
+
+import numpy as np
+import numpy.typing as npt
 
 
 class RPSShapes(enum.Enum):
@@ -72,38 +76,173 @@ class RoundPart2:
             raise Exception("Unexpected move")
 
 
+# score of a round indexed by [left column][right column], with each column
+# numbered 0-2 in the order of the letters above
+SCORE_TABLES = {
+    "move": np.array(
+        [
+            [
+                RoundPart1(opponent_move, your_move).outcome.value + your_move.value
+                for your_move in SELF_MOVES.values()
+            ]
+            for opponent_move in OPPONENT_MOVES.values()
+        ]
+    ),
+    "outcome": np.array(
+        [
+            [
+                RoundPart2(opponent_move, outcome).your_move.value + outcome.value
+                for outcome in OUTCOMES.values()
+            ]
+            for opponent_move in OPPONENT_MOVES.values()
+        ]
+    ),
+}
+
+
+# index of each round into the flattened ``SCORE_TABLES``, by its two columns
+ROUND_IDXS = {
+    (left, right): left_idx * 3 + right_idx
+    for left_idx, left in enumerate(OPPONENT_MOVES)
+    for right_idx, right in enumerate(SELF_MOVES)
+}
+
+
+def parse_strategy_guide(
+    encrypted_strategy_guide: str,
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8]]:
+    """Left and right columns of the guide as 0-2 indices into ``SCORE_TABLES``."""
+    guide = encrypted_strategy_guide.strip().encode()
+    rounds = np.frombuffer(guide + b"\n", dtype=np.uint8)
+    if rounds.size % 4 == 0:
+        rounds = rounds.reshape(-1, 4)
+    if rounds.ndim != 2 or not (
+        (rounds[:, 1] == ord(" ")).all() and (rounds[:, 3] == ord("\n")).all()
+    ):
+        # not exactly one "A X" per line, so go through each line instead
+        round_choices = np.array(
+            [round_txt.split() for round_txt in guide.decode().splitlines()],
+            dtype=str,
+        ).reshape(-1, 2)
+        if round_choices.dtype != np.dtype("U1"):
+            raise Exception("Unexpected move")
+        rounds = round_choices.astype("S1").view(np.uint8)[:, [0, 0, 1]]
+    left_column = rounds[:, 0] - np.uint8(ord("A"))
+    right_column = rounds[:, 2] - np.uint8(ord("X"))
+    if (left_column > 2).any() or (right_column > 2).any():
+        raise Exception("Unexpected move")
+    return left_column, right_column
+
+
 class RockPaperScissors:
     def __init__(
         self,
         encrypted_strategy_guide: str,
         right_column_mode: Literal["move", "outcome"],
     ):
-        self.strategy_guide = []
-        for round_txt in encrypted_strategy_guide.splitlines():
+        if right_column_mode not in SCORE_TABLES:
+            raise Exception("Unexpected param")
+        self._encrypted_strategy_guide = encrypted_strategy_guide
+        self._right_column_mode = right_column_mode
+        self._left_column, self._right_column = parse_strategy_guide(
+            encrypted_strategy_guide
+        )
+
+    @functools.cached_property
+    def strategy_guide(self) -> list[RoundPart1 | RoundPart2]:
+        strategy_guide: list[RoundPart1 | RoundPart2] = []
+        for round_txt in self._encrypted_strategy_guide.splitlines():
             round_choices = round_txt.split()
             assert len(round_choices) == 2
-            round: RoundPart1 | RoundPart2
-            if right_column_mode == "move":
-                round = RoundPart1(
-                    opponent_move=OPPONENT_MOVES[round_choices[0]],
-                    your_move=SELF_MOVES[round_choices[1]],
-                )
-            elif right_column_mode == "outcome":
-                round = RoundPart2(
-                    opponent_move=OPPONENT_MOVES[round_choices[0]],
-                    outcome=OUTCOMES[round_choices[1]],
+            if self._right_column_mode == "move":
+                strategy_guide.append(
+                    RoundPart1(
+                        opponent_move=OPPONENT_MOVES[round_choices[0]],
+                        your_move=SELF_MOVES[round_choices[1]],
+                    )
                 )
             else:
-                raise Exception("Unexpected param")
-            self.strategy_guide.append(round)
+                strategy_guide.append(
+                    RoundPart2(
+                        opponent_move=OPPONENT_MOVES[round_choices[0]],
+                        outcome=OUTCOMES[round_choices[1]],
+                    )
+                )
+        return strategy_guide
 
     def calculate_total_score(self) -> int:
-        return sum(
-            (round.your_move.value + round.outcome.value)
-            for round in self.strategy_guide
+        return int(
+            SCORE_TABLES[self._right_column_mode][
+                self._left_column, self._right_column
+            ].sum()
         )
 
 
+class StreamingRockPaperScissors:
+    def __init__(self) -> None:
+        """
+        Score a strategy guide as it arrives, for both right column modes at
+        once, from chunks of text that need not end on a line break.
+        """
+        self._round_counts = np.zeros(9, dtype=np.int64)
+        self._partial_round = ""
+
+    def feed(self, strategy_guide_chunk: str) -> None:
+        complete_rounds, _, self._partial_round = (
+            self._partial_round + strategy_guide_chunk
+        ).rpartition("\n")
+        self._round_counts += self._count_rounds(complete_rounds)
+
+    def feed_lines(self, strategy_guide_lines: Iterable[str]) -> None:
+        strategy_guide_lines = iter(strategy_guide_lines)
+        if self._partial_round:
+            # the first line finishes the round left over from the last chunk
+            for round_txt in strategy_guide_lines:
+                self.feed(round_txt.rstrip("\r\n") + "\n")
+                break
+        # one line at a time is too little to be worth handing to NumPy
+        round_counts = [0] * 9
+        for round_txt in strategy_guide_lines:
+            round_choices = tuple(round_txt.split())
+            if not round_choices:
+                continue
+            try:
+                round_counts[ROUND_IDXS[round_choices]] += 1
+            except KeyError:
+                raise Exception("Unexpected move") from None
+        self._round_counts += round_counts
+
+    @staticmethod
+    def _count_rounds(encrypted_strategy_guide: str) -> npt.NDArray[np.int64]:
+        if not encrypted_strategy_guide.strip():
+            return np.zeros(9, dtype=np.int64)
+        left_column, right_column = parse_strategy_guide(encrypted_strategy_guide)
+        return np.bincount(left_column * 3 + right_column, minlength=9)
+
+    def _current_round_counts(self) -> npt.NDArray[np.int64]:
+        # a trailing round without a line break is complete once it has both
+        # columns, since neither column is more than one letter
+        if len(self._partial_round.split()) == 2:
+            return self._round_counts + self._count_rounds(self._partial_round)
+        return self._round_counts
+
+    def calculate_total_score(
+        self, right_column_mode: Literal["move", "outcome"]
+    ) -> int:
+        if right_column_mode not in SCORE_TABLES:
+            raise Exception("Unexpected param")
+        return int(
+            self._current_round_counts() @ SCORE_TABLES[right_column_mode].ravel()
+        )
+
+    def calculate_total_scores(self) -> dict[str, int]:
+        round_counts = self._current_round_counts()
+        return {
+            right_column_mode: int(round_counts @ score_table.ravel())
+            for right_column_mode, score_table in SCORE_TABLES.items()
+        }
+
+
 def read_file() -> str:
     with open("input.txt") as f:
         return f.read()
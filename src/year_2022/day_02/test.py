@@ -1,3 +1,6 @@
+import random
+from typing import Literal
+
 import pytest
 
 from day_02 import process
@@ -95,3 +98,61 @@ C Z
         (round.your_move.value + round.outcome.value) for round in rps.strategy_guide
     ] == [4, 1, 7]
     assert rps.calculate_total_score() == 12
+
+
+@pytest.mark.parametrize(
+    "encrypted_strategy_guide",
+    ["A Y\nB X\nC Z\n", "A Y\r\nB X\r\nC Z", "A  Y\nB X\nC Z\n"],
+)
+@pytest.mark.parametrize(
+    "right_column_mode,total_score", [("move", 15), ("outcome", 12)]
+)
+def test_total_score_irregular_layout(
+    encrypted_strategy_guide: str,
+    right_column_mode: Literal["move", "outcome"],
+    total_score: int,
+) -> None:
+    rps = process.RockPaperScissors(
+        encrypted_strategy_guide, right_column_mode=right_column_mode
+    )
+    assert rps.calculate_total_score() == total_score
+
+
+def test_total_score_unexpected_move() -> None:
+    with pytest.raises(Exception, match="Unexpected move"):
+        process.RockPaperScissors("A Y\nD X\n", right_column_mode="move")
+
+
+def test_streaming_total_scores() -> None:
+    rps = process.StreamingRockPaperScissors()
+    assert rps.calculate_total_scores() == {"move": 0, "outcome": 0}
+    rps.feed("A Y\nB")
+    assert rps.calculate_total_scores() == {"move": 8, "outcome": 4}
+    rps.feed(" X\r\nC Z")
+    assert rps.calculate_total_score("move") == 15
+    assert rps.calculate_total_score("outcome") == 12
+    rps.feed("\n")
+    assert rps.calculate_total_scores() == {"move": 15, "outcome": 12}
+
+
+def test_streaming_total_scores_from_lines() -> None:
+    rps = process.StreamingRockPaperScissors()
+    rps.feed_lines(["A Y\n", "B X", "C Z\r\n"])
+    assert rps.calculate_total_scores() == {"move": 15, "outcome": 12}
+
+
+def test_streaming_total_scores_from_many_lines() -> None:
+    rng = random.Random(2)
+    rounds = [f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(1000)]
+    rps = process.StreamingRockPaperScissors()
+    rps.feed("A")
+    rps.feed_lines([" Y\n", *(round_txt + "\n" for round_txt in rounds), ""])
+    encrypted_strategy_guide = "\n".join(["A Y", *rounds])
+    assert rps.calculate_total_scores() == {
+        right_column_mode: process.RockPaperScissors(
+            encrypted_strategy_guide, right_column_mode
+        ).calculate_total_score()
+        for right_column_mode in ("move", "outcome")
+    }
+    with pytest.raises(Exception, match="Unexpected move"):
+        rps.feed_lines(["A Y", "D X"])
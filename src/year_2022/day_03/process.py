@@ -2,10 +2,23 @@ import dataclasses
 import string
 
 import more_itertools
+import numpy as np
+import numpy.typing as npt
 
 
 PRIORITIES = [None] + list(string.ascii_letters)
 
+# item (as a byte) to a mask with the bit for its priority set, so that the
+# priority of a mask with a single item is its bit length
+ITEM_MASKS = [0] * 256
+for priority, item in enumerate(PRIORITIES[1:], start=1):
+    ITEM_MASKS[ord(item)] = 1 << (priority - 1)
+
+# item (as a byte) to its priority less one, i.e. its column in a presence
+# matrix; anything that isn't an item maps past the last column
+ITEM_COLUMNS = np.full(256, len(PRIORITIES) - 1, dtype=np.uint8)
+ITEM_COLUMNS[[ord(item) for item in PRIORITIES[1:]]] = np.arange(len(PRIORITIES) - 1)
+
 
 @dataclasses.dataclass(frozen=True)
 class Rucksack:
@@ -69,6 +82,153 @@ class RucksackReorganisation:
         return self._sum_priorities(elf_group_rucksacks)
 
 
+class BitmaskRucksackReorganisation:
+    def __init__(self, contents: str) -> None:
+        """
+        Same as ``RucksackReorganisation``, but holds each compartment and
+        rucksack as a mask of its item priorities and works out both sums in
+        a single pass over the rucksacks.
+        """
+        self._sum_compartment_priorities = 0
+        self._sum_elf_group_priorities = 0
+        self._rucksack_no = 0
+        elf_group_mask = 0
+        for rucksack_contents in contents.splitlines():
+            items = rucksack_contents.encode()
+            assert len(items) % 2 == 0  # verify even number of items in rucksack
+            first_compartment_mask = self._mask(items[: len(items) // 2])
+            second_compartment_mask = self._mask(items[len(items) // 2 :])
+            self._sum_compartment_priorities += self._priority(
+                first_compartment_mask & second_compartment_mask
+            )
+
+            rucksack_mask = first_compartment_mask | second_compartment_mask
+            if self._rucksack_no % 3 == 0:
+                elf_group_mask = rucksack_mask
+            else:
+                elf_group_mask &= rucksack_mask
+            if self._rucksack_no % 3 == 2:
+                self._sum_elf_group_priorities += self._priority(elf_group_mask)
+            self._rucksack_no += 1
+
+    @classmethod
+    def read_file(cls) -> "BitmaskRucksackReorganisation":
+        with open("input.txt") as f:
+            return cls(f.read())
+
+    @staticmethod
+    def _mask(items: bytes) -> int:
+        # each distinct item has its own bit, so adding is the same as or-ing
+        return sum(map(ITEM_MASKS.__getitem__, set(items)))
+
+    @staticmethod
+    def _priority(common_items_mask: int) -> int:
+        if common_items_mask & (common_items_mask - 1):
+            raise ValueError("More than one common item retrieved")
+        if not common_items_mask:
+            raise ValueError("No common item retrieved")
+        return common_items_mask.bit_length()
+
+    def sum_priorities_of_common_items_across_rucksack_compartments(self) -> int:
+        return self._sum_compartment_priorities
+
+    def sum_priorities_of_common_items_across_elf_group_rucksacks(self) -> int:
+        assert (
+            self._rucksack_no % 3 == 0
+        )  # verify rucksacks can be split amongst each group of three elves
+        return self._sum_elf_group_priorities
+
+
+class ColumnarRucksackReorganisation:
+    def __init__(self, contents: str, block_size: int = 1 << 18) -> None:
+        """
+        Same as ``RucksackReorganisation``, but holds every rucksack in one
+        buffer of items with the offset at which each rucksack starts, and
+        works out the common items of ``block_size`` rucksacks at a time from
+        matrices of which items are present in each compartment.
+        """
+        # blocks are made of whole elf groups
+        self._block_size = max(3, block_size - block_size % 3)
+        contents_bytes = contents.strip().encode()
+        lines = np.frombuffer(
+            contents_bytes + b"\n" if contents_bytes else b"", dtype=np.uint8
+        )
+        lines = lines[lines != ord("\r")]
+        line_ends = np.flatnonzero(lines == ord("\n"))
+        line_starts = np.concatenate(([0], line_ends + 1))[:-1]
+        # verify even number of items in rucksack
+        assert ((line_ends - line_starts) % 2 == 0).all()
+        self._items = ITEM_COLUMNS[np.delete(lines, line_ends)]
+        if (self._items == len(PRIORITIES) - 1).any():
+            raise ValueError("Unexpected item")
+        self._offsets = line_starts - np.arange(line_starts.size)
+        self._offsets = np.append(self._offsets, self._items.size)
+
+    @classmethod
+    def read_file(cls) -> "ColumnarRucksackReorganisation":
+        with open("input.txt") as f:
+            return cls(f.read())
+
+    def _presence(
+        self, first_rucksack: int, last_rucksack: int
+    ) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+        """Items present in each compartment of a block of rucksacks."""
+        offsets = self._offsets[first_rucksack : last_rucksack + 1]
+        start, end = offsets[0], offsets[-1]
+        rucksack_lengths = np.diff(offsets)
+        rucksacks = np.repeat(np.arange(rucksack_lengths.size), rucksack_lengths)
+        in_second_compartment = (
+            np.arange(start, end) - offsets[:-1][rucksacks]
+            >= (rucksack_lengths // 2)[rucksacks]
+        )
+        compartments = np.zeros(
+            (2, rucksack_lengths.size, len(PRIORITIES) - 1), dtype=np.bool_
+        )
+        compartments[
+            in_second_compartment.view(np.uint8), rucksacks, self._items[start:end]
+        ] = True
+        return compartments[0], compartments[1]
+
+    @staticmethod
+    def _sum_priorities(common_items: npt.NDArray[np.bool_]) -> int:
+        common_item_counts = common_items.sum(axis=1)
+        if (common_item_counts > 1).any():
+            raise ValueError("More than one common item retrieved")
+        if (common_item_counts == 0).any():
+            raise ValueError("No common item retrieved")
+        return int((common_items.argmax(axis=1) + 1).sum())
+
+    def _blocks(self) -> range:
+        return range(0, self._offsets.size - 1, self._block_size)
+
+    def sum_priorities_of_common_items_across_rucksack_compartments(self) -> int:
+        sum_priorities = 0
+        for first_rucksack in self._blocks():
+            first_compartments, second_compartments = self._presence(
+                first_rucksack, first_rucksack + self._block_size
+            )
+            sum_priorities += self._sum_priorities(
+                first_compartments & second_compartments
+            )
+        return sum_priorities
+
+    def sum_priorities_of_common_items_across_elf_group_rucksacks(self) -> int:
+        rucksack_no = self._offsets.size - 1
+        assert (
+            rucksack_no % 3 == 0
+        )  # verify rucksacks can be split amongst each group of three elves
+        sum_priorities = 0
+        for first_rucksack in self._blocks():
+            first_compartments, second_compartments = self._presence(
+                first_rucksack, first_rucksack + self._block_size
+            )
+            rucksacks = first_compartments | second_compartments
+            sum_priorities += self._sum_priorities(
+                rucksacks.reshape(-1, 3, rucksacks.shape[1]).all(axis=1)
+            )
+        return sum_priorities
+
+
 def main() -> None:
     rr = RucksackReorganisation.read_file()
     print(
@@ -76,3 +76,64 @@ def test_rucksack_reorganisation_sum_priorities_of_common_items_across_elf_group
     assert (
         rr.sum_priorities_of_common_items_across_elf_group_rucksacks() == sum_priorities
     )
+
+
+def test_bitmask_rucksack_reorganisation() -> None:
+    contents = """\
+vJrwpWtwJgWrhcsFMMfFFhFp
+jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL
+PmmdzqPrVvPwwTWBwg
+wMqvLMZHhHMvwLHjbvcjnnSBnvTQFn
+ttgJtRGJQctTZtZT
+CrZsJsPPZsGzwwsLwLmpwMDw
+"""
+    rr = process.BitmaskRucksackReorganisation(contents)
+    assert rr.sum_priorities_of_common_items_across_rucksack_compartments() == 157
+    assert rr.sum_priorities_of_common_items_across_elf_group_rucksacks() == 70
+
+
+def test_bitmask_rucksack_reorganisation_more_than_one_common_item() -> None:
+    with pytest.raises(ValueError):
+        process.BitmaskRucksackReorganisation("abab\n")
+
+
+@pytest.mark.parametrize("block_size", [3, 4, 1 << 18])
+def test_columnar_rucksack_reorganisation(block_size: int) -> None:
+    contents = """\
+vJrwpWtwJgWrhcsFMMfFFhFp
+jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL
+PmmdzqPrVvPwwTWBwg
+wMqvLMZHhHMvwLHjbvcjnnSBnvTQFn
+ttgJtRGJQctTZtZT
+CrZsJsPPZsGzwwsLwLmpwMDw
+"""
+    rr = process.ColumnarRucksackReorganisation(contents, block_size=block_size)
+    assert rr.sum_priorities_of_common_items_across_rucksack_compartments() == 157
+    assert rr.sum_priorities_of_common_items_across_elf_group_rucksacks() == 70
+
+
+def test_columnar_rucksack_reorganisation_crlf_and_empty() -> None:
+    contents = """\
+vJrwpWtwJgWrhcsFMMfFFhFp
+jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL
+PmmdzqPrVvPwwTWBwg
+""".replace("\n", "\r\n")
+    rr = process.ColumnarRucksackReorganisation(contents)
+    assert rr.sum_priorities_of_common_items_across_rucksack_compartments() == 96
+    assert rr.sum_priorities_of_common_items_across_elf_group_rucksacks() == 18
+
+    rr = process.ColumnarRucksackReorganisation("")
+    assert rr.sum_priorities_of_common_items_across_rucksack_compartments() == 0
+    assert rr.sum_priorities_of_common_items_across_elf_group_rucksacks() == 0
+
+
+@pytest.mark.parametrize(
+    "contents, message",
+    [("abab\n", "More than one common item"), ("abcd\n", "No common item")],
+)
+def test_columnar_rucksack_reorganisation_common_item_count(
+    contents: str, message: str
+) -> None:
+    rr = process.ColumnarRucksackReorganisation(contents)
+    with pytest.raises(ValueError, match=message):
+        rr.sum_priorities_of_common_items_across_rucksack_compartments()
@@ -1,37 +1,170 @@
-from typing import Callable
+import bisect
+import dataclasses
+import heapq
+import itertools
+import math
+from typing import Callable, Iterable, Iterator, Literal
 
+import numpy as np
+import numpy.typing as npt
 
-class ElfRange(set[int]):
-    def __init__(self, start: int, end: int):
-        assert end >= start
-        self.start = start
-        self.end = end
-        super().__init__(range(start, end + 1))
+
+@dataclasses.dataclass(frozen=True, repr=False)
+class ElfRange:
+    start: int
+    end: int
+
+    def __post_init__(self) -> None:
+        assert self.end >= self.start
 
     def __repr__(self) -> str:
         return f"ElfRange({self.start}, {self.end})"
 
+    def __contains__(self, section: int) -> bool:
+        return self.start <= section <= self.end
+
+    def __len__(self) -> int:
+        return self.end - self.start + 1
+
     def contains(self, item: "ElfRange") -> bool:
-        return self >= item
+        return self.start <= item.start and item.end <= self.end
 
     def overlaps(self, item: "ElfRange") -> bool:
-        return bool(self & item)
+        return self.start <= item.end and item.start <= self.end
+
+
+class SectionIndex:
+    def __init__(self, elf_ranges: Iterable[ElfRange]) -> None:
+        """
+        Sorted view over many ranges to answer questions about the whole set
+        of them without comparing every pair.
+        """
+        self._elf_ranges = sorted(
+            elf_ranges, key=lambda elf_range: (elf_range.start, elf_range.end)
+        )
+        self._starts = [elf_range.start for elf_range in self._elf_ranges]
+        self._ends = sorted(elf_range.end for elf_range in self._elf_ranges)
+
+        # segment tree of the furthest end under each node, over the ranges
+        # in order of start, with the leaves from index ``_leaves``
+        self._leaves = 1 << max(len(self._elf_ranges) - 1, 0).bit_length()
+        self._max_ends = [-math.inf] * (2 * self._leaves)
+        for idx, elf_range in enumerate(self._elf_ranges):
+            self._max_ends[self._leaves + idx] = elf_range.end
+        for node in range(self._leaves - 1, 0, -1):
+            self._max_ends[node] = max(
+                self._max_ends[2 * node], self._max_ends[2 * node + 1]
+            )
+
+    def __len__(self) -> int:
+        return len(self._elf_ranges)
+
+    def count_ranges_covering(self, section: int) -> int:
+        """Ranges that have started by the section less those already ended."""
+        return bisect.bisect_right(self._starts, section) - bisect.bisect_left(
+            self._ends, section
+        )
+
+    def ranges_overlapping(self, item: ElfRange) -> list[ElfRange]:
+        """
+        Ranges starting by the end of the item that end at or after its start,
+        in order of start. Only subtrees holding such a range are descended,
+        so this takes O((k + 1) log n) for k overlapping ranges.
+        """
+        starts_before = bisect.bisect_right(self._starts, item.end)
+        overlapping = []
+        to_search = [(1, 0, self._leaves)]
+        while to_search:
+            node, lo, hi = to_search.pop()
+            if lo >= starts_before or self._max_ends[node] < item.start:
+                continue
+            if node >= self._leaves:
+                overlapping.append(self._elf_ranges[lo])
+                continue
+            mid = (lo + hi) // 2
+            to_search.append((2 * node + 1, mid, hi))
+            to_search.append((2 * node, lo, mid))
+        return overlapping
+
+    def count_overlapping_pairs(self) -> int:
+        """All pairs less the pairs where one range starts after the other ends."""
+        disjoint_pairs = sum(
+            len(self._starts) - bisect.bisect_right(self._starts, end)
+            for end in self._ends
+        )
+        return len(self) * (len(self) - 1) // 2 - disjoint_pairs
+
+    def overlapping_pairs(self) -> Iterator[tuple[ElfRange, ElfRange]]:
+        """
+        Sweep the ranges in order of start, keeping the ranges still open
+        at that start (ordered by end) which are the ones it overlaps.
+        """
+        open_ranges: list[tuple[int, int, ElfRange]] = []
+        for idx, elf_range in enumerate(self._elf_ranges):
+            while open_ranges and open_ranges[0][0] < elf_range.start:
+                heapq.heappop(open_ranges)
+            for _, _, open_range in open_ranges:
+                yield open_range, elf_range
+            heapq.heappush(open_ranges, (elf_range.end, idx, elf_range))
+
+    def total_coverage(self) -> int:
+        """Sections covered by at least one range."""
+        coverage = 0
+        covered_to = None
+        for elf_range in self._elf_ranges:
+            if covered_to is None or elf_range.start > covered_to:
+                coverage += len(elf_range)
+                covered_to = elf_range.end
+            elif elf_range.end > covered_to:
+                coverage += elf_range.end - covered_to
+                covered_to = elf_range.end
+        return coverage
 
 
 class CampCleanup:
-    def __init__(self, section_assignment_input: str) -> None:
-        self._section_pairs = [
-            tuple(
-                ElfRange(*[int(boundary) for boundary in section.split("-")])
-                for section in section_assignment_pair.split(",")
-            )
-            for section_assignment_pair in section_assignment_input.splitlines()
-        ]
+    def __init__(
+        self,
+        section_assignment_input: str,
+        mode: Literal["ranges", "arrays"] = "ranges",
+    ) -> None:
+        """
+        In ``"arrays"`` mode the pairs are held as columns of section IDs and
+        compared all at once, rather than as pairs of ``ElfRange``.
+        """
+        self._mode = mode
+        if mode == "ranges":
+            self._section_pairs = [
+                tuple(
+                    ElfRange(*[int(boundary) for boundary in section.split("-")])
+                    for section in section_assignment_pair.split(",")
+                )
+                for section_assignment_pair in section_assignment_input.splitlines()
+            ]
+        elif mode == "arrays":
+            boundaries = np.array(
+                section_assignment_input.replace(",", " ").replace("-", " ").split(),
+                dtype=np.int64,
+            ).reshape(-1, 4)
+            assert (boundaries[:, 1] >= boundaries[:, 0]).all()
+            assert (boundaries[:, 3] >= boundaries[:, 2]).all()
+            self._start1, self._end1, self._start2, self._end2 = boundaries.T
+        else:
+            raise Exception("Unexpected param")
 
     @classmethod
-    def read_file(cls) -> "CampCleanup":
+    def read_file(cls, mode: Literal["ranges", "arrays"] = "ranges") -> "CampCleanup":
         with open("input.txt") as f:
-            return cls(f.read())
+            return cls(f.read(), mode)
+
+    def section_index(self) -> SectionIndex:
+        if self._mode == "arrays":
+            return SectionIndex(
+                ElfRange(int(start), int(end))
+                for start, end in itertools.chain(
+                    zip(self._start1, self._end1), zip(self._start2, self._end2)
+                )
+            )
+        return SectionIndex(itertools.chain.from_iterable(self._section_pairs))
 
     def _two_way_contains(self, range1: ElfRange, range2: ElfRange) -> bool:
         return range1.contains(range2) or range2.contains(range1)
@@ -39,10 +172,22 @@ class CampCleanup:
     def _sum_comp(self, comp_fn: Callable[[ElfRange, ElfRange], bool]) -> int:
         return sum(comp_fn(*pair) for pair in self._section_pairs)
 
+    def _contains_mask(self) -> npt.NDArray[np.bool_]:
+        return ((self._start1 <= self._start2) & (self._end2 <= self._end1)) | (
+            (self._start2 <= self._start1) & (self._end1 <= self._end2)
+        )
+
+    def _overlaps_mask(self) -> npt.NDArray[np.bool_]:
+        return (self._start1 <= self._end2) & (self._start2 <= self._end1)
+
     def sum_ranges_containing_other_ranges(self) -> int:
+        if self._mode == "arrays":
+            return int(self._contains_mask().sum())
         return self._sum_comp(self._two_way_contains)
 
     def sum_ranges_overlapping_other_ranges(self) -> int:
+        if self._mode == "arrays":
+            return int(self._overlaps_mask().sum())
         return self._sum_comp(ElfRange.overlaps)
 
 
@@ -1,3 +1,7 @@
+import itertools
+import random
+from typing import Literal
+
 import pytest
 
 from day_04 import process
@@ -27,7 +31,10 @@ def test_elf_range_contains(
     assert elf1_range.contains(elf0_range) == is_contained_in
 
 
-def test_camp_cleanup_ranges_containing_other_ranges() -> None:
+@pytest.mark.parametrize("mode", ["ranges", "arrays"])
+def test_camp_cleanup_ranges_containing_other_ranges(
+    mode: Literal["ranges", "arrays"],
+) -> None:
     section_assignment_input = """\
 2-4,6-8
 2-3,4-5
@@ -36,7 +43,7 @@ def test_camp_cleanup_ranges_containing_other_ranges() -> None:
 6-6,4-6
 2-6,4-8
 """
-    cc = process.CampCleanup(section_assignment_input)
+    cc = process.CampCleanup(section_assignment_input, mode=mode)
     assert cc.sum_ranges_containing_other_ranges() == 2
 
 
@@ -62,7 +69,10 @@ def test_elf_range_overlaps(
     assert elf0_range.overlaps(elf1_range) == overlaps
 
 
-def test_camp_cleanup_ranges_overlapping_other_ranges() -> None:
+@pytest.mark.parametrize("mode", ["ranges", "arrays"])
+def test_camp_cleanup_ranges_overlapping_other_ranges(
+    mode: Literal["ranges", "arrays"],
+) -> None:
     section_assignment_input = """\
 2-4,6-8
 2-3,4-5
@@ -71,5 +81,74 @@ def test_camp_cleanup_ranges_overlapping_other_ranges() -> None:
 6-6,4-6
 2-6,4-8
 """
-    cc = process.CampCleanup(section_assignment_input)
+    cc = process.CampCleanup(section_assignment_input, mode=mode)
     assert cc.sum_ranges_overlapping_other_ranges() == 4
+
+
+def test_elf_range_large_section_ids() -> None:
+    elf_range = process.ElfRange(1, 10**12)
+    assert len(elf_range) == 10**12
+    assert 10**12 in elf_range
+    assert elf_range.contains(process.ElfRange(2, 10**12 - 1))
+    assert not elf_range.overlaps(process.ElfRange(10**12 + 1, 10**12 + 2))
+
+
+@pytest.mark.parametrize("mode", ["ranges", "arrays"])
+def test_camp_cleanup_section_index(mode: Literal["ranges", "arrays"]) -> None:
+    section_assignment_input = """\
+2-4,6-8
+2-3,4-5
+5-7,7-9
+2-8,3-7
+6-6,4-6
+2-6,4-8
+"""
+    cc = process.CampCleanup(section_assignment_input, mode=mode)
+    elf_ranges = [
+        process.ElfRange(*[int(boundary) for boundary in section.split("-")])
+        for section in section_assignment_input.replace(",", "\n").split()
+    ]
+    section_index = cc.section_index()
+
+    assert len(section_index) == 12
+    for section in range(0, 11):
+        assert section_index.count_ranges_covering(section) == sum(
+            section in elf_range for elf_range in elf_ranges
+        )
+    assert sorted(
+        section_index.ranges_overlapping(process.ElfRange(8, 9)),
+        key=repr,
+    ) == sorted(
+        [process.ElfRange(6, 8), process.ElfRange(7, 9), process.ElfRange(2, 8)]
+        + [process.ElfRange(4, 8)],
+        key=repr,
+    )
+
+    overlapping_pairs = [
+        (elf_range1, elf_range2)
+        for elf_range1, elf_range2 in itertools.combinations(elf_ranges, 2)
+        if elf_range1.overlaps(elf_range2)
+    ]
+    assert section_index.count_overlapping_pairs() == len(overlapping_pairs)
+    assert len(list(section_index.overlapping_pairs())) == len(overlapping_pairs)
+    assert all(
+        elf_range1.overlaps(elf_range2)
+        for elf_range1, elf_range2 in section_index.overlapping_pairs()
+    )
+    assert section_index.total_coverage() == 8
+
+
+def test_section_index_ranges_overlapping() -> None:
+    rng = random.Random(4)
+    elf_ranges = [
+        process.ElfRange(start, start + rng.randint(0, 20))
+        for start in (rng.randint(1, 500) for _ in range(300))
+    ]
+    section_index = process.SectionIndex(elf_ranges)
+    for start in range(-10, 530, 7):
+        item = process.ElfRange(start, start + rng.randint(0, 5))
+        assert sorted(section_index.ranges_overlapping(item), key=repr) == sorted(
+            (elf_range for elf_range in elf_ranges if elf_range.overlaps(item)),
+            key=repr,
+        )
+    assert process.SectionIndex([]).ranges_overlapping(item) == []
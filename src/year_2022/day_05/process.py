@@ -1,7 +1,10 @@
+import collections
 import dataclasses
-from typing import Optional, Literal, Iterator
+import itertools
+from typing import Any, Iterable, Optional, Literal, Iterator
 
-import parse  # type: ignore
+import numpy as np
+import numpy.typing as npt
 
 
 def read_file() -> str:
@@ -9,28 +12,143 @@ def read_file() -> str:
         return f.read()
 
 
-class CrateStacks(list[Optional[list[str]]]):
+@dataclasses.dataclass(frozen=True)
+class CrateChunk:
+    """
+    Run of crates ``crates[start:stop]``, bottom first unless reversed. The
+    crates are shared between chunks and never copied.
+    """
+
+    crates: tuple[str, ...]
+    start: int
+    stop: int
+    reversed: bool = False
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[str]:
+        if self.reversed:
+            return reversed(self.crates[self.start : self.stop])
+        return iter(self.crates[self.start : self.stop])
+
+    @property
+    def top(self) -> str:
+        return self.crates[self.start if self.reversed else self.stop - 1]
+
+    def flip(self) -> "CrateChunk":
+        return dataclasses.replace(self, reversed=not self.reversed)
+
+    def split(self, moves: int) -> tuple["CrateChunk", "CrateChunk"]:
+        """Chunk without the top ``moves`` crates and chunk of just those."""
+        if self.reversed:
+            split = self.start + moves
+            return (
+                dataclasses.replace(self, start=split),
+                dataclasses.replace(self, stop=split),
+            )
+        split = self.stop - moves
+        return (
+            dataclasses.replace(self, stop=split),
+            dataclasses.replace(self, start=split),
+        )
+
+
+class CrateRope:
+    def __init__(self, crates: Iterable[str] = ()) -> None:
+        """
+        Stack of crates held as chunks of crates, bottom first, so that a
+        block of crates moves between stacks chunk by chunk rather than crate
+        by crate.
+        """
+        crates = tuple(crates)
+        self._chunks = [CrateChunk(crates, 0, len(crates))] if crates else []
+        self._len = len(crates)
+
+    def __repr__(self) -> str:
+        return f"CrateRope({list(self)})"
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        return itertools.chain.from_iterable(self._chunks)
+
+    def __getitem__(self, idx: int) -> str:
+        if idx == -1 and self._chunks:
+            return self._chunks[-1].top
+        return list(self)[idx]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (CrateRope, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def pop_block(self, moves: int) -> list[CrateChunk]:
+        """Take the top ``moves`` crates off the stack, bottom chunk first."""
+        if moves > self._len:
+            raise IndexError("pop from empty stack")
+        self._len -= moves
+        block = []
+        while moves:
+            chunk = self._chunks.pop()
+            if len(chunk) > moves:
+                chunk, taken = chunk.split(moves)
+                self._chunks.append(chunk)
+                chunk = taken
+            block.append(chunk)
+            moves -= len(chunk)
+        block.reverse()
+        return block
+
+    def push_block(self, block: list[CrateChunk], reverse: bool = False) -> None:
+        """Put a block of crates on the stack, upside down if ``reverse``."""
+        if reverse:
+            block = [chunk.flip() for chunk in reversed(block)]
+        self._chunks.extend(block)
+        self._len += sum(len(chunk) for chunk in block)
+
+
+CrateStack = list[str] | CrateRope
+
+
+class CrateStacks(list[Optional[CrateStack]]):
     @classmethod
     def from_text(cls, stack_txt: str) -> "CrateStacks":
-        stack_list = reversed(stack_txt.splitlines())
-        header, stack_contents = next(stack_list), list(stack_list)
-        assert (
-            max(int(crate_no) for crate_no in header.strip().split()) <= 9
-        )  # Only a single-digit number of stacks are supported
-        stack_text_indices = [
-            (int(ele), idx) for idx, ele in enumerate(header) if ele != " "
-        ]
-        stacks: list[Optional[list[str]]] = [None] + [[] for _ in stack_text_indices]
-
-        for row in stack_contents:
-            for stack_index, stack_text_index in stack_text_indices:
-                stack_value = row[stack_text_index]
-                if stack_value != " ":  # found a stack value
-                    stack = stacks[stack_index]
-                    assert stack is not None
-                    stack.append(stack_value)
+        *stack_contents, header = [row.rstrip() for row in stack_txt.splitlines()]
+        stack_nos = [int(stack_no) for stack_no in header.split()]
+        assert stack_nos == list(range(1, len(stack_nos) + 1))
+
+        # each stack's crates are in the column its label starts in, between
+        # brackets, so the rows are padded to a grid and read down those
+        # columns, bottom row first
+        width = max(len(row) for row in [header, *stack_contents])
+        header_chars = np.frombuffer(header.ljust(width).encode(), dtype=np.uint8)
+        is_label = header_chars != ord(" ")
+        columns = np.flatnonzero(is_label & ~np.concatenate(([False], is_label[:-1])))
+        grid = np.frombuffer(
+            "".join(row.ljust(width + 1) for row in reversed(stack_contents)).encode(),
+            dtype=np.uint8,
+        ).reshape(len(stack_contents), width + 1)
+        crates = grid[:, columns]
+        has_crate = crates != ord(" ")
+        assert (grid[:, columns - 1] == ord("["))[has_crate].all()
+        assert (grid[:, columns + 1] == ord("]"))[has_crate].all()
+        # nothing else is in the rows but the brackets around each crate
+        assert (grid != ord(" ")).sum() == 3 * has_crate.sum()
+
+        stacks: list[Optional[CrateStack]] = [None]
+        for stack_crates in crates.T.copy():
+            stack = stack_crates.tobytes().decode().rstrip()
+            assert " " not in stack  # verify no gaps below a crate
+            stacks.append(list(stack))
         return cls(stacks)
 
+    def as_ropes(self) -> "CrateStacks":
+        return CrateStacks(
+            [None if stack is None else CrateRope(stack) for stack in self]
+        )
+
     @property
     def end_crates(self) -> str:
         return "".join(stack[-1] for stack in self if stack is not None)
@@ -44,42 +162,107 @@ class Rearrangement:
 
     @classmethod
     def from_text(cls, rearrangement_txt: str) -> "Rearrangement":
-        parsed_text = parse.parse(
-            "move {move:d} from {start:d} to {end:d}", rearrangement_txt
-        )
-        return cls(parsed_text["move"], parsed_text["start"], parsed_text["end"])
+        ((moves, start, end),) = parse_rearrangement_proc(rearrangement_txt).tolist()
+        return cls(moves, start, end)
+
+
+def parse_rearrangement_proc(rearrangements_txt: str) -> npt.NDArray[np.int64]:
+    """Moves, start and end of every rearrangement, one row each."""
+    words = rearrangements_txt.split()
+    if len(words) % 6 or words[0::2] != ["move", "from", "to"] * (len(words) // 6):
+        raise ValueError("Unexpected rearrangement")
+    return np.array(words[1::2], dtype=np.int64).reshape(-1, 3)
 
 
 class SupplyStacks:
-    def __init__(self, input_txt: str, crane_type: Literal["9000", "9001"]) -> None:
+    def __init__(
+        self,
+        input_txt: str,
+        crane_type: Literal["9000", "9001"],
+        stack_type: Literal["list", "rope"] = "list",
+    ) -> None:
         stacks_txt, rearrangements_txt = input_txt.split("\n\n")
         self.crate_stacks = CrateStacks.from_text(stacks_txt)
-        self.rearrangement_proc = [
-            Rearrangement.from_text(rearrangement_txt)
-            for rearrangement_txt in rearrangements_txt.splitlines()
-        ]
+        if stack_type == "rope":
+            self.crate_stacks = self.crate_stacks.as_ropes()
+        elif stack_type != "list":
+            raise Exception("Unexpected stack type")
+        self.rearrangement_proc = parse_rearrangement_proc(rearrangements_txt)
         self.crane_type = crane_type
 
-    def _rearrange(self, rearrangement: Rearrangement) -> CrateStacks:
-        start_stack = self.crate_stacks[rearrangement.start]
-        end_stack = self.crate_stacks[rearrangement.end]
+    def _rearrange(self, moves: int, start: int, end: int) -> CrateStacks:
+        start_stack = self.crate_stacks[start]
+        end_stack = self.crate_stacks[end]
         assert start_stack is not None
         assert end_stack is not None
-        picked_up = []
-        for _ in range(rearrangement.moves):
-            picked_up.append(start_stack.pop())
         if self.crane_type == "9000":
-            dropped_off = picked_up
+            reverse = True  # crates are moved one at a time
         elif self.crane_type == "9001":
-            dropped_off = list(reversed(picked_up))
+            reverse = False
         else:
             raise Exception("Unexpected crane mode")
-        end_stack.extend(dropped_off)
+        if isinstance(start_stack, CrateRope):
+            assert isinstance(end_stack, CrateRope)
+            end_stack.push_block(start_stack.pop_block(moves), reverse=reverse)
+        else:
+            assert isinstance(end_stack, list)
+            split = len(start_stack) - moves
+            if split < 0:
+                raise IndexError("pop from empty list")
+            picked_up = start_stack[split:]
+            del start_stack[split:]
+            end_stack.extend(reversed(picked_up) if reverse else picked_up)
         return self.crate_stacks
 
+    def trace_end_crates(self) -> str:
+        """
+        End crates worked out without moving any crates, by following the
+        top of each stack back through the rearrangement procedure to where
+        it started. Needs the starting stacks, so call it before iterating.
+        """
+        if self.crane_type not in ("9000", "9001"):
+            raise Exception("Unexpected crane mode")
+        heights = [len(stack or []) for stack in self.crate_stacks]
+        for moves, start, end in self.rearrangement_proc.tolist():
+            heights[start] -= moves
+            heights[end] += moves
+            if heights[start] < 0:
+                raise IndexError("pop from empty list")
+        if not all(heights[1:]):
+            raise IndexError("No crate on top of an empty stack")
+
+        # position of each end crate as its depth from the top of a stack,
+        # with the end crates currently in each stack
+        depths = [0] * (len(self.crate_stacks) - 1)
+        end_crates_in_stack = collections.defaultdict(
+            list,
+            {stack_no: [stack_no - 1] for stack_no in range(1, len(self.crate_stacks))},
+        )
+        for moves, start, end in reversed(self.rearrangement_proc.tolist()):
+            for end_crate in end_crates_in_stack[start]:
+                depths[end_crate] += moves
+            stayed = []
+            for end_crate in end_crates_in_stack[end]:
+                if depths[end_crate] < moves:
+                    if self.crane_type == "9000":
+                        depths[end_crate] = moves - 1 - depths[end_crate]
+                    end_crates_in_stack[start].append(end_crate)
+                else:
+                    depths[end_crate] -= moves
+                    stayed.append(end_crate)
+            end_crates_in_stack[end] = stayed
+
+        crates = [""] * len(depths)
+        for stack_no, end_crates in end_crates_in_stack.items():
+            stack = self.crate_stacks[stack_no]
+            assert stack is not None
+            for end_crate in end_crates:
+                crates[end_crate] = stack[-1 - depths[end_crate]]
+        return "".join(crates)
+
     def __iter__(self) -> Iterator[CrateStacks]:
-        for rearrangement in self.rearrangement_proc:
-            yield self._rearrange(rearrangement)
+        for moves, start, end in self.rearrangement_proc.tolist():
+            yield self._rearrange(moves, start, end)
 
 
 def run_crane(file_txt: str, crane_type: Literal["9000", "9001"]) -> None:
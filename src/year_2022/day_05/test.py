@@ -1,3 +1,5 @@
+from typing import Literal
+
 import pytest
 
 from day_05 import process
@@ -32,6 +34,11 @@ def test_rearrangement() -> None:
     )
 
 
+def test_rearrangement_unexpected_text() -> None:
+    with pytest.raises(ValueError):
+        process.Rearrangement.from_text("move 1 from 2")
+
+
 def test_starting_stacks_cranemover_9000() -> None:
     input_txt = """\
     [D]    
@@ -53,27 +60,11 @@ move 1 from 1 to 2
             ["P"],
         ]
     )
-    assert ss.rearrangement_proc == [
-        process.Rearrangement(
-            moves=1,
-            start=2,
-            end=1,
-        ),
-        process.Rearrangement(
-            moves=3,
-            start=1,
-            end=3,
-        ),
-        process.Rearrangement(
-            moves=2,
-            start=2,
-            end=1,
-        ),
-        process.Rearrangement(
-            moves=1,
-            start=1,
-            end=2,
-        ),
+    assert ss.rearrangement_proc.tolist() == [
+        [1, 2, 1],
+        [3, 1, 3],
+        [2, 2, 1],
+        [1, 1, 2],
     ]
     ss_iter = iter(ss)
 
@@ -142,27 +133,11 @@ move 1 from 1 to 2
             ["P"],
         ]
     )
-    assert ss.rearrangement_proc == [
-        process.Rearrangement(
-            moves=1,
-            start=2,
-            end=1,
-        ),
-        process.Rearrangement(
-            moves=3,
-            start=1,
-            end=3,
-        ),
-        process.Rearrangement(
-            moves=2,
-            start=2,
-            end=1,
-        ),
-        process.Rearrangement(
-            moves=1,
-            start=1,
-            end=2,
-        ),
+    assert ss.rearrangement_proc.tolist() == [
+        [1, 2, 1],
+        [3, 1, 3],
+        [2, 2, 1],
+        [1, 1, 2],
     ]
     ss_iter = iter(ss)
 
@@ -208,3 +183,92 @@ move 1 from 1 to 2
         next(ss_iter)
 
     assert ss.crate_stacks.end_crates == "MCD"
+
+
+@pytest.mark.parametrize("crane_type", ["9000", "9001"])
+def test_starting_stacks_rope_stacks(crane_type: Literal["9000", "9001"]) -> None:
+    input_txt = """\
+    [D]    
+[N] [C]    
+[Z] [M] [P]
+ 1   2   3 
+
+move 1 from 2 to 1
+move 3 from 1 to 3
+move 2 from 2 to 1
+move 1 from 1 to 2
+move 3 from 3 to 2
+move 2 from 2 to 1
+"""
+    ss_list = process.SupplyStacks(input_txt, crane_type=crane_type)
+    ss_rope = process.SupplyStacks(input_txt, crane_type=crane_type, stack_type="rope")
+    for crate_stacks_list, crate_stacks_rope in zip(ss_list, ss_rope, strict=True):
+        assert crate_stacks_rope == crate_stacks_list
+    assert ss_rope.crate_stacks.end_crates == ss_list.crate_stacks.end_crates
+    assert all(
+        isinstance(stack, process.CrateRope) for stack in ss_rope.crate_stacks[1:]
+    )
+
+
+def test_crate_rope() -> None:
+    crate_rope = process.CrateRope("ABCDE")
+    other_crate_rope = process.CrateRope("XY")
+    other_crate_rope.push_block(crate_rope.pop_block(3), reverse=True)
+    assert crate_rope == ["A", "B"]
+    assert other_crate_rope == ["X", "Y", "E", "D", "C"]
+    crate_rope.push_block(other_crate_rope.pop_block(4))
+    assert crate_rope == ["A", "B", "Y", "E", "D", "C"]
+    assert crate_rope[-1] == "C"
+    assert len(crate_rope) == 6
+    with pytest.raises(IndexError):
+        other_crate_rope.pop_block(2)
+
+
+def test_crate_stacks_more_than_nine() -> None:
+    crate_stacks_txt = """\
+                                    [K]
+[A] [B] [C] [D] [E] [F] [G] [H] [I] [J]     [L]
+ 1   2   3   4   5   6   7   8   9   10  11  12 
+"""
+    crate_stacks = process.CrateStacks.from_text(crate_stacks_txt)
+    assert crate_stacks == process.CrateStacks(
+        [None, ["A"], ["B"], ["C"], ["D"], ["E"], ["F"], ["G"], ["H"], ["I"]]
+        + [["J", "K"], [], ["L"]]
+    )
+
+
+def test_crate_stacks_by_label_position() -> None:
+    crate_stacks_txt = (
+        "     [D]      \n"
+        "[N]  [C]        \n"
+        "[Z]  [M]  [P]\n"
+        " 1    2    3  \n"
+    )
+    crate_stacks = process.CrateStacks.from_text(crate_stacks_txt)
+    assert crate_stacks == process.CrateStacks(
+        [None, ["Z", "N"], ["M", "C", "D"], ["P"]]
+    )
+    with pytest.raises(AssertionError):
+        process.CrateStacks.from_text("[N]  [C] x\n 1    2 \n")
+
+
+@pytest.mark.parametrize(
+    "crane_type, end_crates",
+    [("9000", "CMZ"), ("9001", "MCD")],
+)
+def test_trace_end_crates(
+    crane_type: Literal["9000", "9001"], end_crates: str
+) -> None:
+    input_txt = """\
+    [D]    
+[N] [C]    
+[Z] [M] [P]
+ 1   2   3 
+
+move 1 from 2 to 1
+move 3 from 1 to 3
+move 2 from 2 to 1
+move 1 from 1 to 2
+"""
+    ss = process.SupplyStacks(input_txt, crane_type=crane_type)
+    assert ss.trace_end_crates() == end_crates
@@ -1,7 +1,14 @@
+import asyncio
+import collections
+import concurrent.futures
 import functools
-from typing import Optional
+import itertools
+import os
+from typing import AsyncIterable, BinaryIO, Collection, Iterable, Iterator, Optional
 
-import more_itertools
+Datastream = str | bytes | bytearray | memoryview
+
+CHUNK_SIZE = 1 << 16
 
 
 def read_file() -> str:
@@ -9,27 +16,184 @@ def read_file() -> str:
         return f.read().strip()
 
 
-def _detect_marker_idx(datastream: str, n: int) -> Optional[int]:
-    for idx, putative_marker in enumerate(
-        more_itertools.windowed(datastream, n), start=n
-    ):
-        if len(set(putative_marker)) == n:
-            return idx
-    return None
+class _MarkerScanner:
+    def __init__(self, *ns: int) -> None:
+        """
+        Finds the first ``n`` distinct characters in a row, for each of
+        ``ns``, across a datastream given in chunks.
+
+        The window of distinct characters ending at each character starts just
+        past the last time that character was seen, if that is inside the
+        window, so the only state kept between chunks is where each character
+        was last seen. The window grows by at most one character at a time, so
+        the markers are found shortest first.
+        """
+        self.marker_idxs: dict[int, int] = {}
+        self._pending_ns = sorted(set(ns), reverse=True)
+        self._last_seen: list[int] | dict[int, int] = [-1] * 256
+        self._window_start = 0
+        self._offset = 0
+
+    def feed(self, chunk: Datastream) -> bool:
+        """Scan the next chunk, returning whether every marker has been found."""
+        if isinstance(chunk, str):
+            try:
+                chunk = chunk.encode("latin-1")
+            except UnicodeEncodeError:
+                # characters past U+00FF don't fit a table of byte values
+                if isinstance(self._last_seen, list):
+                    self._last_seen = collections.defaultdict(
+                        lambda: -1, enumerate(self._last_seen)
+                    )
+                chunk = [ord(char) for char in chunk]
+        elif isinstance(chunk, memoryview):
+            chunk = chunk.cast("B")
+        pending_ns = self._pending_ns
+        last_seen = self._last_seen
+        window_start = self._window_start
+        for idx, char in enumerate(chunk, start=self._offset):
+            if not pending_ns:
+                break
+            if last_seen[char] >= window_start:
+                window_start = last_seen[char] + 1
+            last_seen[char] = idx
+            if idx - window_start + 1 == pending_ns[-1]:
+                self.marker_idxs[pending_ns.pop()] = idx + 1
+        self._window_start = window_start
+        self._offset += len(chunk)
+        return not pending_ns
+
+    def feed_line(self, chunk: bytes) -> bool:
+        """
+        Scan the next chunk up to the end of the line, if it is in the chunk,
+        returning whether there is nothing left to scan for.
+        """
+        line_ends = [idx for idx in (chunk.find(b"\n"), chunk.find(b"\r")) if idx >= 0]
+        if not line_ends:
+            return self.feed(chunk)
+        self.feed(chunk[: min(line_ends)])
+        return True
+
+
+def _detect_marker_idx(datastream: Datastream, n: int) -> Optional[int]:
+    scanner = _MarkerScanner(n)
+    scanner.feed(datastream)
+    return scanner.marker_idxs.get(n)
+
+
+def _scan_file(
+    f: BinaryIO, scanner: _MarkerScanner, chunk_size: int = CHUNK_SIZE
+) -> None:
+    while chunk := f.read(chunk_size):
+        if scanner.feed_line(chunk):
+            return
+
+
+def _detect_marker_idx_in_file(
+    f: BinaryIO, n: int, chunk_size: int = CHUNK_SIZE
+) -> Optional[int]:
+    scanner = _MarkerScanner(n)
+    _scan_file(f, scanner, chunk_size)
+    return scanner.marker_idxs.get(n)
+
+
+async def _detect_marker_idx_in_stream(
+    stream: asyncio.StreamReader | AsyncIterable[bytes],
+    n: int,
+    chunk_size: int = CHUNK_SIZE,
+) -> Optional[int]:
+    scanner = _MarkerScanner(n)
+    if isinstance(stream, asyncio.StreamReader):
+        while chunk := await stream.read(chunk_size):
+            if scanner.feed_line(chunk):
+                break
+    else:
+        async for chunk in stream:
+            if scanner.feed_line(chunk):
+                break
+    return scanner.marker_idxs.get(n)
+
+
+def detect_marker_idxs(
+    datastream: Datastream | os.PathLike, ns: Collection[int]
+) -> dict[int, Optional[int]]:
+    """
+    Index just past each marker of the given lengths, from one pass over a
+    datastream or over the file at a path.
+    """
+    scanner = _MarkerScanner(*ns)
+    if isinstance(datastream, os.PathLike):
+        with open(datastream, "rb") as f:
+            _scan_file(f, scanner)
+    else:
+        scanner.feed(datastream)
+    return {n: scanner.marker_idxs.get(n) for n in ns}
+
+
+def detect_marker_idxs_in_pool(
+    datastreams: Iterable[Datastream | os.PathLike],
+    ns: Collection[int],
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[tuple[int, dict[int, Optional[int]]]]:
+    """
+    ``detect_marker_idxs`` for many datastreams across a process pool,
+    yielding the position of each datastream with its markers as soon as it
+    is done. Datastreams are only read from ``datastreams`` as workers free
+    up, so at most ``max_in_flight`` (by default twice the workers) are held
+    at a time. Paths are read by the workers rather than sent to them.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * max_workers
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        datastreams_iter = enumerate(datastreams)
+        in_flight: dict[concurrent.futures.Future, int] = {}
+        while True:
+            for idx, datastream in itertools.islice(
+                datastreams_iter, max_in_flight - len(in_flight)
+            ):
+                in_flight[executor.submit(detect_marker_idxs, datastream, ns)] = idx
+            if not in_flight:
+                return
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                yield in_flight.pop(future), future.result()
 
 
 detect_start_of_packet_marker_idx = functools.partial(_detect_marker_idx, n=4)
 
 detect_start_of_message_marker_idx = functools.partial(_detect_marker_idx, n=14)
 
+detect_start_of_packet_marker_idx_in_file = functools.partial(
+    _detect_marker_idx_in_file, n=4
+)
 
-def main() -> None:
-    file_txt = read_file()
+detect_start_of_message_marker_idx_in_file = functools.partial(
+    _detect_marker_idx_in_file, n=14
+)
+
+detect_start_of_packet_marker_idx_in_stream = functools.partial(
+    _detect_marker_idx_in_stream, n=4
+)
+
+detect_start_of_message_marker_idx_in_stream = functools.partial(
+    _detect_marker_idx_in_stream, n=14
+)
 
-    print("Start-of-packet marker index:", detect_start_of_packet_marker_idx(file_txt))
-    print(
-        "Start-of-message marker index:", detect_start_of_message_marker_idx(file_txt)
-    )
+
+def main() -> None:
+    with open("input.txt", "rb") as f:
+        print(
+            "Start-of-packet marker index:",
+            detect_start_of_packet_marker_idx_in_file(f),
+        )
+        f.seek(0)
+        print(
+            "Start-of-message marker index:",
+            detect_start_of_message_marker_idx_in_file(f),
+        )
 
 
 if __name__ == "__main__":
@@ -1,3 +1,8 @@
+import asyncio
+import io
+import pathlib
+from typing import AsyncIterator, Callable, Optional
+
 import pytest
 
 from day_06 import process
@@ -29,3 +34,116 @@ def test_detect_start_of_packet_marker_idx(datastream: str, position: int) -> No
 )
 def test_detect_start_of_message_marker_idx(datastream: str, position: int) -> None:
     assert process.detect_start_of_message_marker_idx(datastream) == position
+
+
+@pytest.mark.parametrize("convert", [bytes, bytearray, memoryview])
+def test_detect_marker_idx_bytes(
+    convert: Callable[[bytes], process.Datastream],
+) -> None:
+    datastream = convert(b"mjqjpqmgbljsphdztnvjfqwrcgsmlb")
+    assert process.detect_start_of_packet_marker_idx(datastream) == 7
+    assert process.detect_start_of_message_marker_idx(datastream) == 19
+
+
+@pytest.mark.parametrize(
+    "datastream, n, position",
+    [
+        ("aaaa", 2, None),
+        ("abcabcd", 4, 7),
+        (bytes(range(256)) * 2, 256, 256),
+        (bytes(range(255)) * 2, 256, None),
+        ("αααβγδε", 5, 7),
+        ("ÿÿαÿ", 2, 3),
+        ("日本日本語", 3, 5),
+    ],
+)
+def test_detect_marker_idx(
+    datastream: process.Datastream, n: int, position: Optional[int]
+) -> None:
+    assert process._detect_marker_idx(datastream, n) == position
+
+
+def test_detect_marker_idx_non_latin_1() -> None:
+    assert process.detect_start_of_packet_marker_idx("αβγδε") == 4
+    scanner = process._MarkerScanner(4)
+    assert not scanner.feed("abca")
+    assert scanner.feed("βc")
+    assert scanner.marker_idxs == {4: 5}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_detect_marker_idx_in_file(chunk_size: int) -> None:
+    f = io.BytesIO(b"mjqjpqmgbljsphdztnvjfqwrcgsmlb")
+    assert process._detect_marker_idx_in_file(f, n=4, chunk_size=chunk_size) == 7
+    f.seek(0)
+    assert process._detect_marker_idx_in_file(f, n=14, chunk_size=chunk_size) == 19
+    f.seek(0)
+    assert process._detect_marker_idx_in_file(f, n=27, chunk_size=chunk_size) is None
+
+
+@pytest.mark.parametrize("line_end", [b"\n", b"\r\n"])
+@pytest.mark.parametrize("chunk_size", [1, 2, 1 << 16])
+def test_detect_marker_idx_in_file_ignores_line_end(
+    line_end: bytes, chunk_size: int
+) -> None:
+    f = io.BytesIO(b"aabc" + line_end)
+    assert process._detect_marker_idx_in_file(f, n=4, chunk_size=chunk_size) is None
+    assert process.detect_start_of_packet_marker_idx("aabc\n".strip()) is None
+    f = io.BytesIO(b"aabcd" + line_end)
+    assert process._detect_marker_idx_in_file(f, n=4, chunk_size=chunk_size) == 5
+
+
+def test_detect_marker_idx_in_stream() -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in [b"mjqjpqmgbl", b"jsphdztnvj", b"fqwrcgsmlb"]:
+            yield chunk
+
+    async def stream_reader() -> asyncio.StreamReader:
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"mjqjpqmgbljsphdztnvjfqwrcgsmlb")
+        reader.feed_eof()
+        return reader
+
+    async def detect() -> tuple[Optional[int], Optional[int]]:
+        return (
+            await process.detect_start_of_packet_marker_idx_in_stream(chunks()),
+            await process.detect_start_of_message_marker_idx_in_stream(
+                await stream_reader(), chunk_size=4
+            ),
+        )
+
+    assert asyncio.run(detect()) == (7, 19)
+
+
+def test_detect_marker_idxs(tmp_path: pathlib.Path) -> None:
+    datastream = "mjqjpqmgbljsphdztnvjfqwrcgsmlb"
+    path = tmp_path / "datastream.txt"
+    path.write_text(datastream)
+    for source in (datastream, path):
+        assert process.detect_marker_idxs(source, [14, 4, 27]) == {
+            4: 7,
+            14: 19,
+            27: None,
+        }
+
+
+def test_detect_marker_idxs_in_pool() -> None:
+    datastreams = [
+        "mjqjpqmgbljsphdztnvjfqwrcgsmlb",
+        "bvwbjplbgvbhsrlpgdmjqwftvncz",
+        "nppdvjthqldpwncqszvftbrmjlhg",
+        "nznrnfrfntjfmvfwmzdfjlvtqnbhcprsg",
+        "zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw",
+    ]
+    results = dict(
+        process.detect_marker_idxs_in_pool(
+            iter(datastreams), [4, 14], max_workers=2, max_in_flight=3
+        )
+    )
+    assert results == {
+        0: {4: 7, 14: 19},
+        1: {4: 5, 14: 23},
+        2: {4: 6, 14: 23},
+        3: {4: 10, 14: 29},
+        4: {4: 11, 14: 26},
+    }
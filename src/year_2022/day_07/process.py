@@ -1,10 +1,18 @@
+import array
+import bisect
 import dataclasses
+import functools
+import itertools
 import operator
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from typing import Optional, Union
 
 import more_itertools
 
+DISK_SIZE = 70_000_000
+
+SPACE_REQUIRED = 30_000_000
+
 
 def read_file() -> str:
     with open("input.txt") as f:
@@ -18,8 +26,20 @@ class Dir:
         compare=False
     )  # ignore parent reference for __eq__ checks to avoid RecursionError
 
-    @property
+    @functools.cached_property
     def size(self) -> int:
+        """Size of the directory, worked out once it is complete and then kept."""
+        # work out subdirectory sizes deepest first, so that each one only has
+        # to add up sizes already worked out, however deep the tree goes
+        subdirs = [self]
+        for dir_ in subdirs:
+            subdirs.extend(
+                file
+                for file in dir_.files.values()
+                if isinstance(file, Dir) and "size" not in file.__dict__
+            )
+        for subdir in reversed(subdirs[1:]):
+            subdir.size
         return sum(
             (file.size if isinstance(file, Dir) else file)
             for file in self.files.values()
@@ -74,17 +94,178 @@ def process_out(out: str) -> Dir:
     return dir_
 
 
+def stream_dir_sizes(out: Iterable[str]) -> Iterator[int]:
+    """
+    Size of each directory as soon as the transcript leaves it, root last,
+    keeping only the sizes of the directories on the current path.
+
+    Assumes, as a depth-first transcript does, that each directory is listed
+    once and left for good when the transcript changes to its parent.
+    """
+    path_sizes: list[int] = []
+    for line in out:
+        match line.split():
+            case ["$", "cd", "/"]:
+                while len(path_sizes) > 1:
+                    size = path_sizes.pop()
+                    path_sizes[-1] += size
+                    yield size
+                if not path_sizes:
+                    path_sizes.append(0)
+            case ["$", "cd", ".."]:
+                assert len(path_sizes) > 1
+                size = path_sizes.pop()
+                path_sizes[-1] += size
+                yield size
+            case ["$", "cd", _]:
+                assert path_sizes
+                path_sizes.append(0)
+            case ["$", "ls"] | ["dir", _] | []:
+                pass
+            case [size, _]:
+                assert path_sizes
+                path_sizes[-1] += int(size)
+            case _:
+                raise ValueError("Unexpected command")
+    while path_sizes:
+        size = path_sizes.pop()
+        if path_sizes:
+            path_sizes[-1] += size
+        yield size
+
+
+def sum_dirs_below_100k_from_out(out: Iterable[str]) -> int:
+    return sum(size for size in stream_dir_sizes(out) if size <= 100_000)
+
+
+def min_dir_size_to_free_space_from_out(
+    out: Iterable[str],
+    disk_size: int = DISK_SIZE,
+    space_required: int = SPACE_REQUIRED,
+) -> int:
+    # the root is needed to know how much space to free, and it comes last
+    *dir_sizes, root_size = stream_dir_sizes(out)
+    size_req = space_required - (disk_size - root_size)
+    return min(size for size in dir_sizes + [root_size] if size >= size_req)
+
+
+class CompactFs:
+    ROOT = 0
+
+    def __init__(self) -> None:
+        """
+        Directory tree held as parallel arrays indexed by directory, with the
+        root first. Directory names are interned and files are only counted
+        towards the size of the directory they are in.
+        """
+        self.names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self.name_ids = array.array("q")
+        self.parents = array.array("q")
+        self.sizes = array.array("q")  # files directly in the directory
+        self._listed = bytearray()
+        # each directory by its parent and name, packed into one int key
+        self._child_idxs: dict[int, int] = {}
+        self._add_dir("/", parent=-1)
+
+    def _add_dir(self, name: str, parent: int) -> int:
+        if (name_id := self._name_ids.get(name)) is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        dir_idx = len(self.parents)
+        self.name_ids.append(name_id)
+        self.parents.append(parent)
+        self.sizes.append(0)
+        self._listed.append(False)
+        if parent >= 0:
+            self._child_idxs[parent << 32 | name_id] = dir_idx
+        return dir_idx
+
+    def children(self, dir_idx: int) -> list[int]:
+        """Subdirectories of a directory, found by going through every directory."""
+        return [
+            child_idx
+            for child_idx, parent in enumerate(self.parents)
+            if parent == dir_idx
+        ]
+
+    def _child(self, dir_idx: int, name: str) -> int:
+        try:
+            return self._child_idxs[dir_idx << 32 | self._name_ids[name]]
+        except KeyError:
+            raise ValueError("Unexpected directory") from None
+
+    @classmethod
+    def from_out(cls, out: str | Iterable[str]) -> "CompactFs":
+        if isinstance(out, str):
+            out = out.splitlines()
+        fs = cls()
+        curr_dir = None
+        listing = False
+        for line in out:
+            match line.split():
+                case ["$", "cd", "/"]:
+                    curr_dir = cls.ROOT
+                case ["$", "cd", ".."]:
+                    assert curr_dir is not None
+                    curr_dir = fs.parents[curr_dir]
+                    assert curr_dir >= 0
+                case ["$", "cd", dir_name]:
+                    assert curr_dir is not None
+                    curr_dir = fs._child(curr_dir, dir_name)
+                case ["$", "ls"]:
+                    assert curr_dir is not None
+                    # listing a directory again mustn't count its files twice
+                    listing = not fs._listed[curr_dir]
+                    fs._listed[curr_dir] = True
+                case ["dir", dir_name]:
+                    assert curr_dir is not None
+                    if listing:
+                        fs._add_dir(dir_name, parent=curr_dir)
+                case [size, _]:
+                    assert curr_dir is not None
+                    if listing:
+                        fs.sizes[curr_dir] += int(size)
+                case []:
+                    pass
+                case _:
+                    raise ValueError("Unexpected command")
+        return fs
+
+    @functools.cached_property
+    def dir_sizes(self) -> array.array:
+        """Size of each directory including its subdirectories."""
+        dir_sizes = array.array("q", self.sizes)
+        # subdirectories always come after their parent
+        for dir_idx in range(len(dir_sizes) - 1, self.ROOT, -1):
+            dir_sizes[self.parents[dir_idx]] += dir_sizes[dir_idx]
+        return dir_sizes
+
+    @property
+    def size(self) -> int:
+        return self.dir_sizes[self.ROOT]
+
+    def sum_dirs_below_100k(self) -> int:
+        return sum(size for size in self.dir_sizes if size <= 100_000)
+
+    def min_dir_size_to_free_space(
+        self, disk_size: int = DISK_SIZE, space_required: int = SPACE_REQUIRED
+    ) -> int:
+        size_left = disk_size - self.size
+        size_req = space_required - size_left
+        return min(size for size in self.dir_sizes if size >= size_req)
+
+
 def _dir_search(fs: Dir, size: int, comp_fn: Callable[[int, int], bool]) -> list[Dir]:
     dirs = []
-
-    def search(dir_: Dir) -> None:
+    to_search = [fs]
+    while to_search:
+        dir_ = to_search.pop()
         if comp_fn(dir_.size, size):
             dirs.append(dir_)
-        for file in dir_.files.values():
-            if isinstance(file, Dir):
-                search(file)
-
-    search(fs)
+        to_search.extend(
+            reversed([file for file in dir_.files.values() if isinstance(file, Dir)])
+        )
     return dirs
 
 
@@ -92,9 +273,11 @@ def dirs_below_100k(fs: Dir) -> list[Dir]:
     return _dir_search(fs, size=100_000, comp_fn=operator.le)
 
 
-def dirs_to_free_space(fs: Dir) -> list[Dir]:
-    size_left = 70_000_000 - fs.size
-    size_req = 30_000_000 - size_left
+def dirs_to_free_space(
+    fs: Dir, disk_size: int = DISK_SIZE, space_required: int = SPACE_REQUIRED
+) -> list[Dir]:
+    size_left = disk_size - fs.size
+    size_req = space_required - size_left
 
     return _dir_search(fs, size=size_req, comp_fn=operator.ge)
 
@@ -104,11 +287,48 @@ def sum_dirs_below_100k(fs: Dir) -> int:
     return sum(dir_.size for dir_ in dirs_)
 
 
-def min_dir_size_to_free_space(fs: Dir) -> int:
-    dirs_ = dirs_to_free_space(fs)
+def min_dir_size_to_free_space(
+    fs: Dir, disk_size: int = DISK_SIZE, space_required: int = SPACE_REQUIRED
+) -> int:
+    dirs_ = dirs_to_free_space(fs, disk_size, space_required)
     return min(dir_.size for dir_ in dirs_)
 
 
+class DirSizeIndex:
+    def __init__(self, dir_sizes: Iterable[int]) -> None:
+        """
+        Directory sizes in order with running totals, to answer queries over
+        the sizes of all directories without going through every directory.
+        """
+        self._dir_sizes = sorted(dir_sizes)
+        self._cumulative_sizes = [0, *itertools.accumulate(self._dir_sizes)]
+
+    @classmethod
+    def from_fs(cls, fs: Dir | CompactFs) -> "DirSizeIndex":
+        if isinstance(fs, CompactFs):
+            return cls(fs.dir_sizes)
+        return cls(dir_.size for dir_ in _dir_search(fs, 0, operator.ge))
+
+    @property
+    def used_space(self) -> int:
+        # the root contains every other directory
+        return self._dir_sizes[-1]
+
+    def sum_dirs_at_most(self, size: int) -> int:
+        return self._cumulative_sizes[bisect.bisect_right(self._dir_sizes, size)]
+
+    def min_dir_at_least(self, size: int) -> int:
+        idx = bisect.bisect_left(self._dir_sizes, size)
+        if idx == len(self._dir_sizes):
+            raise ValueError("No directory is large enough")
+        return self._dir_sizes[idx]
+
+    def min_dir_size_to_free_space(
+        self, disk_size: int = DISK_SIZE, space_required: int = SPACE_REQUIRED
+    ) -> int:
+        return self.min_dir_at_least(space_required - (disk_size - self.used_space))
+
+
 def main() -> None:
     out = read_file()
     fs = process_out(out)
@@ -1,3 +1,7 @@
+import io
+
+import pytest
+
 from day_07 import process
 
 
@@ -182,3 +186,159 @@ $ ls
     filesystem = process.process_out(terminal_out)
 
     assert process.min_dir_size_to_free_space(filesystem) == 24933642
+
+
+def test_deep_filesystem() -> None:
+    depth = 5_000
+    terminal_out = "\n".join(
+        ["$ cd /"]
+        + [f"$ ls\ndir d{idx}\n1 f\n$ cd d{idx}" for idx in range(depth)]
+        + ["$ ls\n1 f"]
+    )
+    filesystem = process.process_out(terminal_out)
+
+    assert filesystem.size == depth + 1
+    assert process.sum_dirs_below_100k(filesystem) == sum(range(1, depth + 2))
+
+
+def test_compact_fs() -> None:
+    terminal_out = """\
+$ cd /
+$ ls
+dir a
+14848514 b.txt
+8504156 c.dat
+dir d
+$ cd a
+$ ls
+dir e
+29116 f
+2557 g
+62596 h.lst
+$ cd e
+$ ls
+584 i
+$ cd ..
+$ cd ..
+$ cd d
+$ ls
+4060174 j
+8033020 d.log
+5626152 d.ext
+7214296 k
+$ cd /
+$ ls
+dir a
+14848514 b.txt
+8504156 c.dat
+dir d
+"""
+    fs = process.CompactFs.from_out(io.StringIO(terminal_out))
+
+    assert [fs.names[fs.name_ids[dir_idx]] for dir_idx in range(4)] == [
+        "/",
+        "a",
+        "d",
+        "e",
+    ]
+    assert fs.children(fs.ROOT) == [1, 2]
+    assert list(fs.dir_sizes) == [48381165, 94853, 24933642, 584]
+    assert fs.sum_dirs_below_100k() == 95437
+    assert fs.min_dir_size_to_free_space() == 24933642
+
+
+def test_compact_fs_wide_tree() -> None:
+    dir_no = 20_000
+    terminal_out = ["$ cd /", "$ ls"]
+    terminal_out += [f"dir d{dir_idx}" for dir_idx in range(dir_no)]
+    for dir_idx in range(dir_no):
+        terminal_out += [f"$ cd d{dir_idx}", "$ ls", f"{dir_idx} f", "$ cd .."]
+    fs = process.CompactFs.from_out(terminal_out)
+    assert fs.size == dir_no * (dir_no - 1) // 2
+    assert fs.dir_sizes[fs._child(fs.ROOT, "d123")] == 123
+
+
+def test_stream_dir_sizes() -> None:
+    terminal_out = """\
+$ cd /
+$ ls
+dir a
+14848514 b.txt
+8504156 c.dat
+dir d
+$ cd a
+$ ls
+dir e
+29116 f
+2557 g
+62596 h.lst
+$ cd e
+$ ls
+584 i
+$ cd ..
+$ cd ..
+$ cd d
+$ ls
+4060174 j
+8033020 d.log
+5626152 d.ext
+7214296 k
+"""
+    assert list(process.stream_dir_sizes(io.StringIO(terminal_out))) == [
+        584,
+        94853,
+        24933642,
+        48381165,
+    ]
+    assert process.sum_dirs_below_100k_from_out(io.StringIO(terminal_out)) == 95437
+    assert (
+        process.min_dir_size_to_free_space_from_out(io.StringIO(terminal_out))
+        == 24933642
+    )
+
+
+def test_dir_size_index() -> None:
+    terminal_out = """\
+$ cd /
+$ ls
+dir a
+14848514 b.txt
+8504156 c.dat
+dir d
+$ cd a
+$ ls
+dir e
+29116 f
+2557 g
+62596 h.lst
+$ cd e
+$ ls
+584 i
+$ cd ..
+$ cd ..
+$ cd d
+$ ls
+4060174 j
+8033020 d.log
+5626152 d.ext
+7214296 k
+"""
+    for fs in (
+        process.process_out(terminal_out),
+        process.CompactFs.from_out(terminal_out),
+    ):
+        index = process.DirSizeIndex.from_fs(fs)
+        assert index.used_space == 48381165
+        assert index.sum_dirs_at_most(100_000) == 95437
+        assert index.sum_dirs_at_most(583) == 0
+        assert index.sum_dirs_at_most(10**9) == 48381165 + 94853 + 24933642 + 584
+        assert index.min_dir_size_to_free_space() == 24933642
+        assert index.min_dir_size_to_free_space(disk_size=80_000_000) == 584
+        assert index.min_dir_at_least(94854) == 24933642
+        with pytest.raises(ValueError):
+            index.min_dir_at_least(48381166)
+
+    filesystem = process.process_out(terminal_out)
+    assert (
+        process.min_dir_size_to_free_space(filesystem, disk_size=100_000_000) == 584
+    )
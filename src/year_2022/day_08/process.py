@@ -1,8 +1,13 @@
+import concurrent.futures
 import dataclasses
 import enum
-import io
+import functools
+import itertools
 import math
-from typing import Callable, Iterator
+import multiprocessing.managers
+import os
+from multiprocessing import shared_memory
+from typing import Literal, Optional
 
 import numpy as np
 import numpy.typing as npt
@@ -45,74 +50,315 @@ class Tree(dict[Direction, TreeDirectionDetails]):
 
 
 class TreetopTreeHouse:
-    def __init__(self, tree_height_map: str) -> None:
-        self._tree_map = self._create_tree_map(tree_height_map)
-        self.trees = self._create_trees()
+    def __init__(
+        self,
+        tree_height_map: str | npt.NDArray[np.uint8],
+        engine: Literal["stack", "numpy"] = "stack",
+    ) -> None:
+        if isinstance(tree_height_map, str):
+            self._tree_map = self._create_tree_map(tree_height_map)
+        else:
+            self._tree_map = tree_height_map
+        if engine == "stack":
+            self._view_distances, self._visibility = self._survey_trees()
+        elif engine == "numpy":
+            self._view_distances, self._visibility = self._survey_trees_numpy()
+        else:
+            raise Exception("Unexpected engine")
 
     @classmethod
     def read_file(cls) -> "TreetopTreeHouse":
         with open("input.txt") as f:
             return cls(f.read())
 
-    def _create_tree_map(self, tree_height_map: str) -> npt.NDArray[np.int32]:
-        f = io.StringIO(tree_height_map)
-        first_line = f.readline().strip()
-        f.seek(0)
-        return np.genfromtxt(f, dtype="i4", delimiter=[1] * len(first_line))
+    @classmethod
+    def from_path(
+        cls,
+        path: str | os.PathLike = "input.txt",
+        engine: Literal["stack", "numpy"] = "stack",
+        mmap: bool = False,
+    ) -> "TreetopTreeHouse":
+        """
+        With ``mmap``, the trees are read straight from the file as it is
+        mapped into memory, so the heights are left as their digits, which
+        compare in the same way.
+        """
+        return cls(cls.load_tree_map(path, mmap), engine)
 
-    def _create_tree_details(
-        self,
-        current_tree_height: int,
-        direction: Direction,
-        directional_trees: npt.NDArray[np.int32],
-    ) -> TreeDirectionDetails:
-        if direction in (Direction.LEFT, Direction.TOP):
-            directional_trees = np.flip(directional_trees)
-        view_distance = 0
-        for view_distance, tree_height in enumerate(directional_trees, start=1):
-            if tree_height >= current_tree_height:
-                return TreeDirectionDetails(
-                    view_distance=view_distance, is_visible=False
-                )
-        return TreeDirectionDetails(
-            view_distance=view_distance, is_visible=True
-        )  # no trees can be found
-
-    def _create_tree(self, row: int, col: int) -> Tree:
-        tree_height = self._tree_map[row, col]
-        directions = {
-            Direction.LEFT: self._tree_map[row, :col],
-            Direction.RIGHT: self._tree_map[row, col + 1 :],
-            Direction.TOP: self._tree_map[:row, col],
-            Direction.BOTTOM: self._tree_map[row + 1 :, col],
-        }
-        tree = Tree(
-            {
-                direction: self._create_tree_details(
-                    tree_height, direction, directional_trees
+    @classmethod
+    def load_tree_map(
+        cls, path: str | os.PathLike = "input.txt", mmap: bool = False
+    ) -> npt.NDArray[np.uint8]:
+        if not mmap:
+            with open(path) as f:
+                return cls._create_tree_map(f.read())
+        tree_map_bytes = np.memmap(path, dtype=np.uint8, mode="r")
+        return cls._grid_view(tree_map_bytes)
+
+    @staticmethod
+    def _grid_view(tree_map_bytes: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+        """
+        Rows of a height map, without their line endings. Rows may end in
+        "\n" or "\r\n", and the last row may have no line ending at all.
+        """
+        # the first row is all that's needed to find the width
+        probe_size = 1 << 12
+        width = tree_map_bytes[:probe_size].tobytes().find(b"\n")
+        while width < 0 and probe_size < tree_map_bytes.size:
+            probe_size *= 2
+            width = tree_map_bytes[:probe_size].tobytes().find(b"\n")
+        if width < 0:
+            return tree_map_bytes.reshape(1, -1)
+        line_ending = b"\n"
+        if width and tree_map_bytes[width - 1] == ord("\r"):
+            line_ending = b"\r\n"
+            width -= 1
+
+        row_size = width + len(line_ending)
+        rows = -(-tree_map_bytes.size // row_size)
+        missing_line_ending = rows * row_size - tree_map_bytes.size
+        if missing_line_ending in (0, len(line_ending)):
+            (stride,) = tree_map_bytes.strides
+            line_endings = np.lib.stride_tricks.as_strided(
+                tree_map_bytes[width:],
+                shape=(rows - bool(missing_line_ending), len(line_ending)),
+                strides=(row_size * stride, stride),
+                writeable=False,
+            )
+            if (line_endings == np.frombuffer(line_ending, dtype=np.uint8)).all():
+                return np.lib.stride_tricks.as_strided(
+                    tree_map_bytes,
+                    shape=(rows, width),
+                    strides=(row_size * stride, stride),
+                    writeable=False,
                 )
-                for direction, directional_trees in directions.items()
-            }
+        raise ValueError("Height map rows must be the same width")
+
+    @classmethod
+    def _create_tree_map(cls, tree_height_map: str) -> npt.NDArray[np.uint8]:
+        tree_map_bytes = tree_height_map.strip().encode()
+        grid = cls._grid_view(np.frombuffer(tree_map_bytes, dtype=np.uint8))
+        return grid - np.uint8(ord("0"))
+
+    @staticmethod
+    def _survey_line(tree_heights: list[int]) -> tuple[list[int], list[bool]]:
+        """
+        View distance looking back along a line of trees, and whether each
+        tree is visible from the start of the line.
+
+        Trees that are still in view from further along the line are kept on
+        a stack, tallest at the bottom, so each tree is pushed and popped
+        once.
+        """
+        view_distances = []
+        visibility = []
+        in_view: list[int] = []
+        for idx, tree_height in enumerate(tree_heights):
+            while in_view and tree_heights[in_view[-1]] < tree_height:
+                in_view.pop()
+            if in_view:  # blocked by the nearest tree at least as tall
+                view_distances.append(idx - in_view[-1])
+                visibility.append(False)
+            else:  # no trees can be found
+                view_distances.append(idx)
+                visibility.append(True)
+            in_view.append(idx)
+        return view_distances, visibility
+
+    @staticmethod
+    def _directional_view(grid: npt.NDArray, direction: Direction) -> npt.NDArray:
+        """View of a grid with each line running from the edge in a direction."""
+        match direction:
+            case Direction.LEFT:
+                return grid
+            case Direction.RIGHT:
+                return grid[:, ::-1]
+            case Direction.TOP:
+                return grid.T
+            case Direction.BOTTOM:
+                return grid.T[:, ::-1]
+            case _:
+                raise Exception("Unexpected direction")
+
+    def _survey_trees(
+        self,
+    ) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.bool_]]:
+        """View distance and visibility of every tree in each direction."""
+        view_distances = np.zeros(
+            (len(Direction), *self._tree_map.shape), dtype=np.int32
+        )
+        visibility = np.zeros((len(Direction), *self._tree_map.shape), dtype=bool)
+        for direction_idx, direction in enumerate(Direction):
+            directional_tree_map = self._directional_view(self._tree_map, direction)
+            directional_view_distances = self._directional_view(
+                view_distances[direction_idx], direction
+            )
+            directional_visibility = self._directional_view(
+                visibility[direction_idx], direction
+            )
+            for line_idx, tree_heights in enumerate(directional_tree_map.tolist()):
+                (
+                    directional_view_distances[line_idx],
+                    directional_visibility[line_idx],
+                ) = self._survey_line(tree_heights)
+        return view_distances, visibility
+
+    @staticmethod
+    def _survey_lines_numpy(
+        tree_lines: npt.NDArray[np.uint8],
+    ) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.bool_]]:
+        """
+        Same as ``_survey_line``, but for every line of trees at once.
+
+        A tree is visible if it is taller than the tallest tree before it,
+        and its view distance is how far back the last tree at least as tall
+        is, found from the position of the last tree at least as tall as each
+        height so far.
+        """
+        view_distances = np.zeros(tree_lines.shape, dtype=np.int32)
+        visibility = np.ones(tree_lines.shape, dtype=bool)
+        if not tree_lines.size:
+            return view_distances, visibility
+        visibility[:, 1:] = tree_lines[:, 1:] > np.maximum.accumulate(
+            tree_lines[:, :-1], axis=1
+        )
+
+        lowest_tree_height = tree_lines.min()
+        tree_heights = np.arange(lowest_tree_height, tree_lines.max() + 1)
+        lines = np.arange(tree_lines.shape[0])
+        # trees start off blocked by the edge, which is the first tree
+        last_at_least = np.zeros((tree_heights.size, lines.size), dtype=np.int32)
+        for idx in range(tree_lines.shape[1]):
+            line_tree_heights = tree_lines[:, idx]
+            view_distances[:, idx] = (
+                idx - last_at_least[line_tree_heights - lowest_tree_height, lines]
+            )
+            last_at_least[tree_heights[:, np.newaxis] <= line_tree_heights] = idx
+        return view_distances, visibility
+
+    def _survey_trees_numpy(
+        self,
+    ) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.bool_]]:
+        """Same as ``_survey_trees``, but working on whole lines at a time."""
+        view_distances = np.zeros(
+            (len(Direction), *self._tree_map.shape), dtype=np.int32
         )
-        return tree
+        visibility = np.zeros((len(Direction), *self._tree_map.shape), dtype=bool)
+        for direction_idx, direction in enumerate(Direction):
+            (
+                self._directional_view(view_distances[direction_idx], direction)[:],
+                self._directional_view(visibility[direction_idx], direction)[:],
+            ) = self._survey_lines_numpy(
+                self._directional_view(self._tree_map, direction)
+            )
+        return view_distances, visibility
 
-    def _create_trees(self) -> dict[Coords, Tree]:
+    @functools.cached_property
+    def trees(self) -> dict[Coords, Tree]:
         trees = {}
-        tree_map_iter = np.nditer(self._tree_map, flags=["multi_index"])
-        for _ in tree_map_iter:
-            row, col = tree_map_iter.multi_index
-            tree = self._create_tree(row, col)
-            trees[Coords(col, row)] = tree
+        for row, col in np.ndindex(self._tree_map.shape):
+            trees[Coords(col, row)] = Tree(
+                {
+                    direction: TreeDirectionDetails(
+                        view_distance=int(
+                            self._view_distances[direction_idx, row, col]
+                        ),
+                        is_visible=bool(self._visibility[direction_idx, row, col]),
+                    )
+                    for direction_idx, direction in enumerate(Direction)
+                }
+            )
         return trees
 
-    def _treehouse_query(self, fn: Callable[[Iterator[int]], int], query: str) -> int:
-        return fn(getattr(tree, query) for tree in self.trees.values())
-
     def sum_visible_trees(self) -> int:
-        return self._treehouse_query(sum, "is_visible")
+        return int(self._visibility.any(axis=0).sum())
 
     def max_scenic_score(self) -> int:
-        return self._treehouse_query(max, "scenic_score")
+        return int(self._view_distances.prod(axis=0, dtype=np.int64).max())
+
+
+def _survey_band(
+    shared_memory_names: tuple[str, str, str],
+    shape: tuple[int, int],
+    axis: int,
+    start: int,
+    stop: int,
+) -> None:
+    """
+    Survey a band of rows (``axis`` 0) from the left and right, or a band of
+    columns (``axis`` 1) from the top and bottom, into shared visibility and
+    scenic scores. Column bands must be surveyed after every row band.
+    """
+    shms = [shared_memory.SharedMemory(name=name) for name in shared_memory_names]
+    try:
+        tree_map, visibility, scenic_scores = (
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            for shm, dtype in zip(shms, (np.uint8, np.bool_, np.int64))
+        )
+        band = np.s_[start:stop] if axis == 0 else np.s_[:, start:stop]
+        tree_lines = tree_map[band] if axis == 0 else tree_map[band].T
+        view_distances, band_visibility = TreetopTreeHouse._survey_lines_numpy(
+            tree_lines
+        )
+        back_view_distances, back_visibility = TreetopTreeHouse._survey_lines_numpy(
+            tree_lines[:, ::-1]
+        )
+        band_visibility |= back_visibility[:, ::-1]
+        band_scenic_scores = view_distances.astype(np.int64)
+        band_scenic_scores *= back_view_distances[:, ::-1]
+        if axis == 0:
+            visibility[band] = band_visibility
+            scenic_scores[band] = band_scenic_scores
+        else:
+            visibility[band] |= band_visibility.T
+            scenic_scores[band] *= band_scenic_scores.T
+        del tree_map, visibility, scenic_scores
+    finally:
+        for shm in shms:
+            shm.close()
+
+
+def survey_in_pool(
+    tree_map: npt.NDArray[np.uint8],
+    max_workers: Optional[int] = None,
+    bands: Optional[int] = None,
+) -> tuple[int, int]:
+    """
+    Sum of visible trees and highest scenic score, surveyed in bands across a
+    process pool.
+
+    Rows are surveyed from the left and right in bands of rows, and then
+    columns from the top and bottom in bands of columns, so no band depends
+    on another band in the same pass. The bands work on a copy of the trees
+    in shared memory and combine their results there.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    bands = bands or max_workers
+    shape = tree_map.shape
+    with multiprocessing.managers.SharedMemoryManager() as smm:
+        shms = [
+            smm.SharedMemory(max(1, tree_map.size * np.dtype(dtype).itemsize))
+            for dtype in (np.uint8, np.bool_, np.int64)
+        ]
+        shared_tree_map = np.ndarray(shape, dtype=np.uint8, buffer=shms[0].buf)
+        shared_tree_map[:] = tree_map
+        shared_memory_names = tuple(shm.name for shm in shms)
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            for axis in (0, 1):
+                band_edges = np.linspace(0, shape[axis], bands + 1, dtype=int)
+                for future in [
+                    executor.submit(
+                        _survey_band, shared_memory_names, shape, axis, start, stop
+                    )
+                    for start, stop in itertools.pairwise(band_edges.tolist())
+                    if start < stop
+                ]:
+                    future.result()
+        visibility = np.ndarray(shape, dtype=np.bool_, buffer=shms[1].buf)
+        scenic_scores = np.ndarray(shape, dtype=np.int64, buffer=shms[2].buf)
+        result = int(visibility.sum()), int(scenic_scores.max(initial=0))
+        del shared_tree_map, visibility, scenic_scores
+    return result
 
 
 def main() -> None:
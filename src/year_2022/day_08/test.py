@@ -1,3 +1,6 @@
+import pathlib
+from typing import Literal
+
 import pytest
 
 from day_08 import process
@@ -209,14 +212,17 @@ def test_treetop_tree_house_is_visible(
     assert tree.is_visible == overall_assertion
 
 
-def test_treetop_tree_house_sum_visible_trees() -> None:
+@pytest.mark.parametrize("engine", ["stack", "numpy"])
+def test_treetop_tree_house_sum_visible_trees(
+    engine: Literal["stack", "numpy"],
+) -> None:
     tree_height_map = """\
 30373
 25512
 65332
 33549
 35390"""
-    tth = process.TreetopTreeHouse(tree_height_map)
+    tth = process.TreetopTreeHouse(tree_height_map, engine=engine)
     assert tth.sum_visible_trees() == 21
 
 
@@ -263,12 +269,78 @@ def test_treetop_tree_house_scenic_score(
     assert tree.scenic_score == overall_assertion
 
 
-def test_treetop_tree_house_max_scenic_score() -> None:
+@pytest.mark.parametrize("engine", ["stack", "numpy"])
+def test_treetop_tree_house_max_scenic_score(engine: Literal["stack", "numpy"]) -> None:
     tree_height_map = """\
 30373
 25512
 65332
 33549
 35390"""
-    tth = process.TreetopTreeHouse(tree_height_map)
+    tth = process.TreetopTreeHouse(tree_height_map, engine=engine)
+    assert tth.max_scenic_score() == 8
+
+
+@pytest.mark.parametrize(
+    "tree_height_map",
+    [
+        """\
+30373
+25512
+65332""",
+        """\
+303
+255
+653
+335
+353""",
+    ],
+)
+@pytest.mark.parametrize("engine", ["stack", "numpy"])
+def test_treetop_tree_house_rectangular(
+    tree_height_map: str, engine: Literal["stack", "numpy"]
+) -> None:
+    tth = process.TreetopTreeHouse(tree_height_map, engine=engine)
+    assert tth.sum_visible_trees() == 14
+    assert tth.max_scenic_score() == 2
+
+
+@pytest.mark.parametrize(
+    "tree_height_map",
+    [
+        b"30373\n25512\n65332\n33549\n35390\n",
+        b"30373\n25512\n65332\n33549\n35390",
+        b"30373\r\n25512\r\n65332\r\n33549\r\n35390\r\n",
+        b"30373\r\n25512\r\n65332\r\n33549\r\n35390",
+    ],
+)
+@pytest.mark.parametrize("mmap", [False, True])
+@pytest.mark.parametrize("engine", ["stack", "numpy"])
+def test_treetop_tree_house_from_path(
+    tmp_path: pathlib.Path,
+    engine: Literal["stack", "numpy"],
+    mmap: bool,
+    tree_height_map: bytes,
+) -> None:
+    path = tmp_path / "input.txt"
+    path.write_bytes(tree_height_map)
+    tth = process.TreetopTreeHouse.from_path(path, engine=engine, mmap=mmap)
+    assert tth.sum_visible_trees() == 21
     assert tth.max_scenic_score() == 8
+
+
+@pytest.mark.parametrize(
+    "tree_height_map",
+    ["30373\n2551\n65332", "30373\n25512\n6533", "30373\r\n25512\n65332\r\n"],
+)
+def test_treetop_tree_house_uneven_rows(tree_height_map: str) -> None:
+    with pytest.raises(ValueError):
+        process.TreetopTreeHouse(tree_height_map)
+
+
+@pytest.mark.parametrize("bands", [None, 1, 3, 10])
+def test_survey_in_pool(bands: int | None) -> None:
+    tree_map = process.TreetopTreeHouse._create_tree_map(
+        "30373\n25512\n65332\n33549\n35390"
+    )
+    assert process.survey_in_pool(tree_map, max_workers=2, bands=bands) == (21, 8)
@@ -0,0 +1,550 @@
+"""
+Seeded synthetic puzzle input generators.
+
+Each generator produces an input of ``scale`` units along the dimension that
+drives that day's solver. A unit is about the size of a real puzzle input,
+except where the current solver is too slow for that to be a useful starting
+point, in which case it is scaled down to something that solves in about a
+second. The same seed, day and scale always produce the same input.
+"""
+import itertools
+import math
+import random
+import string
+from collections.abc import Callable, Iterator
+
+
+def generate_day_01(scale: int, rng: random.Random) -> str:
+    """250 elf inventories per unit."""
+    elves = [
+        "\n".join(str(rng.randint(1000, 60_000)) for _ in range(rng.randint(1, 15)))
+        for _ in range(250 * scale)
+    ]
+    return "\n\n".join(elves) + "\n"
+
+
+def generate_day_02(scale: int, rng: random.Random) -> str:
+    """2,500 rounds per unit."""
+    return "".join(
+        f"{rng.choice('ABC')} {rng.choice('XYZ')}\n" for _ in range(2500 * scale)
+    )
+
+
+def generate_day_03(scale: int, rng: random.Random) -> str:
+    """
+    100 elf groups (300 rucksacks) per unit.
+
+    Each group splits the letters (bar the badge) into three disjoint pools so
+    the badge is the only item common to the group, and each rucksack splits
+    its pool between its compartments so exactly one item is in both.
+    """
+    rucksacks = []
+    for _ in range(100 * scale):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, rest = letters[0], letters[1:]
+        for pool in (rest[0::3], rest[1::3], rest[2::3]):
+            items = pool + [badge]
+            rng.shuffle(items)
+            common, others = items[0], items[1:]
+            half = len(others) // 2
+            left_items, right_items = others[:half], others[half:]
+            compartment_size = rng.randint(4, 16)
+            left = [common] + rng.choices(left_items, k=compartment_size - 1)
+            right = [common] + rng.choices(right_items, k=compartment_size - 1)
+            if badge != common:
+                (left if badge in left_items else right)[-1] = badge
+            rng.shuffle(left)
+            rng.shuffle(right)
+            rucksacks.append("".join(left + right))
+    return "\n".join(rucksacks) + "\n"
+
+
+def generate_day_04(scale: int, rng: random.Random) -> str:
+    """1,000 section assignment pairs per unit."""
+
+    def section() -> str:
+        start = rng.randint(1, 99)
+        return f"{start}-{rng.randint(start, 99)}"
+
+    return "".join(f"{section()},{section()}\n" for _ in range(1000 * scale))
+
+
+def generate_day_05(scale: int, rng: random.Random) -> str:
+    """
+    50 crates and 500 rearrangements per unit, over 9 stacks.
+
+    No rearrangement ever empties a stack, so every stack has a top crate at
+    the end.
+    """
+    stack_no = 9
+    stacks = [[rng.choice(string.ascii_uppercase)] for _ in range(stack_no)]
+    for _ in range(50 * scale - stack_no):
+        rng.choice(stacks).append(rng.choice(string.ascii_uppercase))
+
+    heights = [len(stack) for stack in stacks]
+    moves = []
+    for _ in range(500 * scale):
+        start = rng.choice([idx for idx, height in enumerate(heights) if height > 1])
+        end = rng.choice([idx for idx in range(stack_no) if idx != start])
+        move = rng.randint(1, min(heights[start] - 1, 30))
+        heights[start] -= move
+        heights[end] += move
+        moves.append(f"move {move} from {start + 1} to {end + 1}")
+
+    rows = []
+    for level in reversed(range(max(len(stack) for stack in stacks))):
+        rows.append(
+            " ".join(
+                f"[{stack[level]}]" if level < len(stack) else "   "
+                for stack in stacks
+            )
+        )
+    rows.append(" ".join(f" {stack_idx} " for stack_idx in range(1, stack_no + 1)))
+    return "\n".join(rows) + "\n\n" + "\n".join(moves) + "\n"
+
+
+def generate_day_06(scale: int, rng: random.Random) -> str:
+    """
+    4,096 characters per unit.
+
+    Only three distinct characters are used until the final fourteen, so both
+    markers are found at the very end of the datastream.
+    """
+    length = 4096 * scale
+    return (
+        "".join(rng.choices("abc", k=length - 14))
+        + "".join(rng.sample(string.ascii_lowercase, k=14))
+        + "\n"
+    )
+
+
+def generate_day_07(scale: int, rng: random.Random) -> str:
+    """
+    180 directories and 800 files per unit, as a depth-first transcript.
+
+    File sizes are log-uniform so that there's a mix of small and large
+    directories either side of the 100k threshold.
+    """
+    dir_no = 180 * scale
+    children: list[list[int]] = [[] for _ in range(dir_no)]
+    for dir_idx in range(1, dir_no):
+        children[rng.randrange(dir_idx)].append(dir_idx)
+    files: list[list[int]] = [[] for _ in range(dir_no)]
+    for _ in range(800 * scale):
+        files[rng.randrange(dir_no)].append(round(10 ** rng.uniform(2, 5.5)))
+    for dir_idx in range(dir_no):
+        # `ls` always lists something in a real transcript
+        if not children[dir_idx] and not files[dir_idx]:
+            files[dir_idx].append(round(10 ** rng.uniform(2, 5.5)))
+
+    out = ["$ cd /"]
+
+    def visit(dir_idx: int) -> None:
+        out.append("$ ls")
+        entries = [f"dir d{child_idx}" for child_idx in children[dir_idx]] + [
+            f"{size} f{file_idx}.{rng.choice(['txt', 'dat', 'log', 'lst'])}"
+            for file_idx, size in enumerate(files[dir_idx])
+        ]
+        rng.shuffle(entries)
+        out.extend(entries)
+        for child_idx in children[dir_idx]:
+            out.append(f"$ cd d{child_idx}")
+            visit(child_idx)
+            out.append("$ cd ..")
+
+    visit(0)
+    return "\n".join(out) + "\n"
+
+
+def generate_day_08(scale: int, rng: random.Random) -> str:
+    """A 99 x 99 grid per unit of area."""
+    side = round(99 * math.sqrt(scale))
+    return "".join(
+        "".join(rng.choices(string.digits, k=side)) + "\n" for _ in range(side)
+    )
+
+
+def generate_day_09(scale: int, rng: random.Random) -> str:
+    """200 motions per unit."""
+    return "".join(
+        f"{rng.choice('UDLR')} {rng.randint(1, 20)}\n" for _ in range(200 * scale)
+    )
+
+
+def generate_day_10(scale: int, rng: random.Random) -> str:
+    """140 instructions per unit."""
+    return "".join(
+        "noop\n" if rng.random() < 0.3 else f"addx {rng.randint(-20, 20)}\n"
+        for _ in range(140 * scale)
+    )
+
+
+def generate_day_11(scale: int, rng: random.Random) -> str:
+    """
+    4 monkeys per unit, holding 1 to 3 items each.
+
+    The first monkey of each unit squares worry levels, and no monkey throws
+    to it, so each item is squared at most once and worry levels stay small
+    in the first part, where they aren't kept within the test divisors.
+    """
+    monkey_no = 4 * scale
+    notes = []
+    for monkey_idx in range(monkey_no):
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 3)))
+        if monkey_idx % 4 == 0:
+            op = "old * old"
+        else:
+            op = rng.choice(
+                [f"old * {rng.randint(2, 19)}", f"old + {rng.randint(1, 8)}"]
+            )
+        if_true, if_false = rng.sample(
+            [idx for idx in range(monkey_no) if idx % 4 and idx != monkey_idx], k=2
+        )
+        notes.append(
+            f"Monkey {monkey_idx}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = {op}\n"
+            f"  Test: divisible by {rng.choice([2, 3, 5, 7, 11, 13, 17, 19, 23])}\n"
+            f"    If true: throw to monkey {if_true}\n"
+            f"    If false: throw to monkey {if_false}"
+        )
+    return "\n\n".join(notes) + "\n"
+
+
+def generate_day_12(scale: int, rng: random.Random) -> str:
+    """
+    A 14 x 50 heightmap per unit of area.
+
+    The top row is a staircase from ``S`` to ``E`` so the summit is always
+    reachable; the rest of the map is noise around the same gradient.
+    """
+    height = max(round(14 * math.sqrt(scale)), 2)
+    width = max(round(50 * math.sqrt(scale)), 27)
+
+    def elevation(x: int) -> int:
+        return 25 * x // (width - 1)
+
+    rows = [
+        "S"
+        + "".join(string.ascii_lowercase[elevation(x)] for x in range(1, width - 1))
+        + "E"
+    ]
+    for _ in range(height - 1):
+        rows.append(
+            "".join(
+                string.ascii_lowercase[
+                    min(max(elevation(x) + rng.randint(-3, 1), 0), 25)
+                ]
+                for x in range(width)
+            )
+        )
+    return "\n".join(rows) + "\n"
+
+
+def generate_day_13(scale: int, rng: random.Random) -> str:
+    """150 packet pairs per unit."""
+
+    def packet(depth: int = 0) -> str:
+        items = [
+            packet(depth + 1)
+            if depth < 4 and rng.random() < 0.3
+            else str(rng.randint(0, 10))
+            for _ in range(rng.randint(0, 5))
+        ]
+        return "[" + ",".join(items) + "]"
+
+    return "\n\n".join(f"{packet()}\n{packet()}" for _ in range(150 * scale)) + "\n"
+
+
+def generate_day_14(scale: int, rng: random.Random) -> str:
+    """
+    10 rock paths per unit, in a cave 30 deep.
+
+    The cave deepens with the square root of the scale so that the density of
+    rock, and the amount of sand per unit of scale, stays constant. Rock is
+    kept strictly inside the triangle below the source, so the edges of a sand
+    pile are never supported and sand always ends up falling into the abyss.
+    """
+    depth = round(30 * math.sqrt(scale))
+    paths = []
+    while len(paths) < 10 * scale:
+        y = rng.randint(5, depth)
+        x = rng.randint(500 - y + 1, 500 + y - 1)
+        points = [(x, y)]
+        for segment_idx in range(rng.randint(1, 4)):
+            length = rng.randint(1, 8) * rng.choice([-1, 1])
+            if segment_idx % 2 == 0:
+                x += length
+            else:
+                y += length
+            points.append((x, y))
+        if all(abs(x - 500) < y for x, y in points):
+            paths.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return "\n".join(paths) + "\n"
+
+
+def generate_day_15(scale: int, rng: random.Random) -> str:
+    """
+    25 sensors per unit, laid out in a jittered lattice over the search area.
+
+    Each sensor reaches three lattice spacings, which covers every position at
+    least once, then any sensor that would reach the hidden beacon is shrunk to
+    stop one short of it. That leaves exactly one uncovered position, which is
+    placed in the first few thousand rows so that the row-by-row search stays
+    affordable and its cost is driven by the number of sensors.
+    """
+    search_size = 4_000_000
+    lattice_size = max(round(5 * math.sqrt(scale)), 2)
+    spacing = search_size // lattice_size
+    jitter = spacing // 4
+    reach = 3 * spacing
+    hidden_x = rng.randint(1, search_size - 1)
+    hidden_y = rng.randint(1000, 5000)
+
+    readings = []
+    for i, j in itertools.product(range(-2, lattice_size + 2), repeat=2):
+        x = i * spacing + spacing // 2 + rng.randint(-jitter, jitter)
+        y = j * spacing + spacing // 2 + rng.randint(-jitter, jitter)
+        hidden_distance = abs(x - hidden_x) + abs(y - hidden_y)
+        sensor_reach = min(reach, hidden_distance - 1)
+        readings.append(
+            f"Sensor at x={x}, y={y}: closest beacon is at x={x + sensor_reach}, y={y}"
+        )
+    rng.shuffle(readings)
+    return "\n".join(readings) + "\n"
+
+
+def _names(letters: str, min_length: int) -> Iterator[str]:
+    for length in itertools.count(min_length):
+        for name in itertools.product(letters, repeat=length):
+            yield "".join(name)
+
+
+def generate_day_16(scale: int, rng: random.Random) -> str:
+    """
+    8 working valves and 30 stuck valves per unit.
+
+    Only the stuck valves scale, so the search over valves to open stays the
+    same size while the graph that has to be pruned grows.
+    """
+    names = list(itertools.islice(_names(string.ascii_uppercase, 2), 8 + 30 * scale))
+    flow_rates = {name: 0 for name in names}
+    for name in rng.sample(names[1:], k=8):
+        flow_rates[name] = rng.randint(3, 25)
+
+    tunnels: dict[str, set[str]] = {name: set() for name in names}
+    order = names[:]
+    rng.shuffle(order)
+    for idx, name in enumerate(order[1:], start=1):
+        neighbour = order[rng.randrange(idx)]
+        tunnels[name].add(neighbour)
+        tunnels[neighbour].add(name)
+    for _ in range(len(names) // 4):
+        valve, neighbour = rng.sample(names, k=2)
+        tunnels[valve].add(neighbour)
+        tunnels[neighbour].add(valve)
+
+    lines = []
+    for name in names:
+        neighbours = sorted(tunnels[name])
+        tunnel_txt = (
+            f"tunnels lead to valves {', '.join(neighbours)}"
+            if len(neighbours) > 1
+            else f"tunnel leads to valve {neighbours[0]}"
+        )
+        lines.append(f"Valve {name} has flow rate={flow_rates[name]}; {tunnel_txt}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_17(scale: int, rng: random.Random) -> str:
+    """A 300 jet pattern per unit."""
+    return "".join(rng.choices("<>", k=300 * scale)) + "\n"
+
+
+def generate_day_18(scale: int, rng: random.Random) -> str:
+    """2,800 cubes per unit, filling about a third of a growing bounding cube."""
+    side = round(20 * scale ** (1 / 3))
+    cubes = rng.sample(range(side**3), k=min(2800 * scale, side**3))
+    return "".join(
+        f"{cube % side},{cube // side % side},{cube // side**2}\n" for cube in cubes
+    )
+
+
+def generate_day_19(scale: int, rng: random.Random) -> str:
+    """
+    3 blueprints per unit, the fewest that the second part looks at.
+
+    Ore robots cost too much to build more than a few, which keeps the number
+    of states searched small enough to solve each blueprint in well under a
+    second rather than minutes.
+    """
+    return "".join(
+        f"Blueprint {no}: "
+        f"Each ore robot costs {rng.randint(20, 24)} ore. "
+        f"Each clay robot costs {rng.randint(3, 4)} ore. "
+        f"Each obsidian robot costs {rng.randint(3, 4)} ore"
+        f" and {rng.randint(8, 12)} clay. "
+        f"Each geode robot costs {rng.randint(3, 4)} ore"
+        f" and {rng.randint(10, 14)} obsidian.\n"
+        for no in range(1, 3 * scale + 1)
+    )
+
+
+def generate_day_20(scale: int, rng: random.Random) -> str:
+    """1,200 numbers per unit, exactly one of which is zero."""
+    numbers = [
+        rng.choice([-1, 1]) * rng.randint(1, 10_000) for _ in range(1200 * scale - 1)
+    ]
+    numbers.insert(rng.randint(0, len(numbers)), 0)
+    return "".join(f"{number}\n" for number in numbers)
+
+
+def generate_day_21(scale: int, rng: random.Random) -> str:
+    """
+    1,000 operation monkeys (and 1,001 number monkeys) per unit.
+
+    Values are assigned top-down, so every division is exact. ``root`` adds two
+    equal halves, and ``humn`` only ever appears in the left one, so its own
+    number is the answer to the equality test.
+    """
+    names = (
+        name
+        for name in _names(string.ascii_lowercase, 4)
+        if name not in ("root", "humn")
+    )
+    root_operands = (next(names), next(names))
+    operands: dict[str, tuple[str, str]] = {}
+    leaves = list(root_operands)
+    for _ in range(1200 * scale - 1):
+        leaf = leaves.pop(rng.randrange(len(leaves)))
+        operands[leaf] = (next(names), next(names))
+        leaves.extend(operands[leaf])
+
+    humn = rng.choice(
+        [name for name in _subtree(operands, root_operands[0]) if name not in operands]
+    )
+
+    def label(name: str) -> str:
+        return "humn" if name == humn else name
+
+    half = rng.randint(1000, 100_000)
+    values = {root_operands[0]: half, root_operands[1]: half}
+    lines = [f"root: {root_operands[0]} + {root_operands[1]}"]
+    stack = list(root_operands)
+    while stack:
+        name = stack.pop()
+        target = values[name]
+        if name not in operands:
+            lines.append(f"{label(name)}: {target}")
+            continue
+        left, right = operands[name]
+        divisors = [divisor for divisor in range(2, 13) if target % divisor == 0]
+        op = rng.choice(["+", "-", "*", "/"] if target > 1 else ["-", "/"])
+        if op == "*" and not divisors:
+            op = "/"
+        if op == "+":
+            values[left] = rng.randint(1, target - 1)
+            values[right] = target - values[left]
+        elif op == "-":
+            values[right] = rng.randint(1, 100)
+            values[left] = target + values[right]
+        elif op == "*":
+            values[right] = rng.choice(divisors)
+            values[left] = target // values[right]
+        else:
+            values[right] = rng.randint(2, 10)
+            values[left] = target * values[right]
+        lines.append(f"{name}: {label(left)} {op} {label(right)}")
+        stack.extend([left, right])
+
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def _subtree(operands: dict[str, tuple[str, str]], name: str) -> Iterator[str]:
+    stack = [name]
+    while stack:
+        name = stack.pop()
+        yield name
+        if name in operands:
+            stack.extend(operands[name])
+
+
+def generate_day_22(scale: int, rng: random.Random) -> str:
+    """
+    2,000 path instructions per unit, over a fixed cube net with 50-tile faces.
+
+    Only the path scales, as the cube solver expects the puzzle's face size.
+    """
+    face_size = 50
+    net = ["_##", "_#_", "##_", "#__"]
+    rows = []
+    for net_row in net:
+        width = len(net_row.rstrip("_")) * face_size
+        for _ in range(face_size):
+            rows.append(
+                "".join(
+                    " "
+                    if net_row[x // face_size] == "_"
+                    else ("#" if rng.random() < 0.1 else ".")
+                    for x in range(width)
+                )
+            )
+    rows[0] = rows[0][:face_size] + "." + rows[0][face_size + 1 :]
+
+    path = [str(rng.randint(1, 50))]
+    for _ in range(1200 * scale - 1):
+        path.extend([rng.choice("LR"), str(rng.randint(1, 50))])
+    return "\n".join(rows) + "\n\n" + "".join(path) + "\n"
+
+
+def generate_day_23(scale: int, rng: random.Random) -> str:
+    """A 20 x 20 grove, half full of elves, per unit of area."""
+    side = round(20 * math.sqrt(scale))
+    return "".join(
+        "".join(rng.choice(".#") for _ in range(side)) + "\n" for _ in range(side)
+    )
+
+
+def generate_day_24(scale: int, rng: random.Random) -> str:
+    """
+    A 16 x 4 valley per unit of area, with blizzards on a third of it.
+
+    The entrance and exit columns only get horizontal blizzards, as in the
+    puzzle, so no blizzard ever blows into either of them.
+    """
+    width = round(16 * math.sqrt(scale))
+    height = round(4 * math.sqrt(scale))
+    rows = ["#." + "#" * width]
+    for _ in range(height):
+        row = []
+        for x in range(width):
+            blizzards = "<>" if x in (0, width - 1) else "<>^v"
+            row.append(rng.choice(blizzards) if rng.random() < 1 / 3 else ".")
+        rows.append("#" + "".join(row) + "#")
+    rows.append("#" * width + ".#")
+    return "\n".join(rows) + "\n"
+
+
+def generate_day_25(scale: int, rng: random.Random) -> str:
+    """120 SNAFU numbers per unit."""
+    return "".join(
+        rng.choice("12") + "".join(rng.choices("=-012", k=rng.randint(0, 19))) + "\n"
+        for _ in range(120 * scale)
+    )
+
+
+GENERATORS: dict[int, Callable[[int, random.Random], str]] = {
+    int(name.removeprefix("generate_day_")): generator
+    for name, generator in list(globals().items())
+    if name.startswith("generate_day_")
+}
+
+
+def generate(day: int, scale: int, seed: int = 2022) -> str:
+    try:
+        generator = GENERATORS[day]
+    except KeyError as exc:
+        raise ValueError(f"No input generator registered for day {day}") from exc
+    return generator(scale, random.Random(f"{seed}-{day}-{scale}"))
@@ -0,0 +1,558 @@
+"""Run each day's solver as separately timed parse, part 1 and part 2 phases.
+
+Run from this directory so that the ``day_XX`` packages are importable:
+
+    python runner.py                   # every day with an input.txt
+    python runner.py 1 8 14 -n 20      # selected days, 20 repetitions
+    python runner.py --json out.json   # also export the results
+"""
+import argparse
+import dataclasses
+import json
+import math
+import pathlib
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any, Optional
+
+
+DAYS_DIR = pathlib.Path(__file__).parent
+
+PHASES = ("parse", "part_1", "part_2")
+
+
+@dataclasses.dataclass(frozen=True)
+class Solver:
+    parse: Callable[[str], Any]
+    part_1: Callable[[Any], Any]
+    part_2: Optional[Callable[[Any], Any]] = None
+
+
+def _exhaust(it: Iterator[Any]) -> Any:
+    """Run an iterator to completion and return its ``StopIteration`` value."""
+    while True:
+        try:
+            next(it)
+        except StopIteration as exc:
+            return exc.value
+
+
+def _solver_day_01() -> Solver:
+    from day_01 import process
+
+    return Solver(
+        parse=process.CalorieCounting,
+        part_1=process.CalorieCounting.calculate_calories_of_elf_carrying_most_calories,
+        part_2=process.CalorieCounting.calculate_calories_of_top_three_elves_carrying_most_calories,
+    )
+
+
+def _solver_day_02() -> Solver:
+    from day_02 import process
+
+    return Solver(
+        parse=lambda txt: (
+            process.RockPaperScissors(txt, right_column_mode="move"),
+            process.RockPaperScissors(txt, right_column_mode="outcome"),
+        ),
+        part_1=lambda rps: rps[0].calculate_total_score(),
+        part_2=lambda rps: rps[1].calculate_total_score(),
+    )
+
+
+def _solver_day_03() -> Solver:
+    from day_03 import process
+
+    return Solver(
+        parse=process.RucksackReorganisation,
+        part_1=process.RucksackReorganisation.sum_priorities_of_common_items_across_rucksack_compartments,
+        part_2=process.RucksackReorganisation.sum_priorities_of_common_items_across_elf_group_rucksacks,
+    )
+
+
+def _solver_day_04() -> Solver:
+    from day_04 import process
+
+    return Solver(
+        parse=process.CampCleanup,
+        part_1=process.CampCleanup.sum_ranges_containing_other_ranges,
+        part_2=process.CampCleanup.sum_ranges_overlapping_other_ranges,
+    )
+
+
+def _solver_day_05() -> Solver:
+    from day_05 import process
+
+    def run(ss: process.SupplyStacks) -> str:
+        for _ in ss:
+            pass
+        return ss.crate_stacks.end_crates
+
+    return Solver(
+        parse=lambda txt: (
+            process.SupplyStacks(txt, crane_type="9000"),
+            process.SupplyStacks(txt, crane_type="9001"),
+        ),
+        part_1=lambda ss: run(ss[0]),
+        part_2=lambda ss: run(ss[1]),
+    )
+
+
+def _solver_day_06() -> Solver:
+    from day_06 import process
+
+    return Solver(
+        parse=str.strip,
+        part_1=process.detect_start_of_packet_marker_idx,
+        part_2=process.detect_start_of_message_marker_idx,
+    )
+
+
+def _solver_day_07() -> Solver:
+    from day_07 import process
+
+    return Solver(
+        parse=lambda txt: process.process_out(txt.strip()),
+        part_1=process.sum_dirs_below_100k,
+        part_2=process.min_dir_size_to_free_space,
+    )
+
+
+def _solver_day_08() -> Solver:
+    from day_08 import process
+
+    return Solver(
+        parse=process.TreetopTreeHouse,
+        part_1=process.TreetopTreeHouse.sum_visible_trees,
+        part_2=process.TreetopTreeHouse.max_scenic_score,
+    )
+
+
+def _solver_day_09() -> Solver:
+    from day_09 import process
+
+    def run(rb: process.RopeBridge) -> int:
+        for _ in rb:
+            pass
+        return len(rb.rope.tail_history)
+
+    return Solver(
+        parse=lambda txt: (
+            process.RopeBridge(txt, knot_no=2),
+            process.RopeBridge(txt, knot_no=10),
+        ),
+        part_1=lambda rbs: run(rbs[0]),
+        part_2=lambda rbs: run(rbs[1]),
+    )
+
+
+def _solver_day_10() -> Solver:
+    from day_10 import process
+
+    key_cycles = [
+        process.Cycle(no=no, state=process.CycleState.DURING)
+        for no in range(20, 221, 40)
+    ]
+
+    def run(crt: process.CathodeRayTube) -> process.CathodeRayTube:
+        for _ in crt:
+            pass
+        return crt
+
+    return Solver(
+        parse=lambda txt: (
+            process.CathodeRayTube(txt, watch_cycles=key_cycles, high_contrast=True),
+            process.CathodeRayTube(txt, high_contrast=True),
+        ),
+        part_1=lambda crts: sum(run(crts[0]).watched_cycles.values()),
+        part_2=lambda crts: run(crts[1]).screen,
+    )
+
+
+def _solver_day_11() -> Solver:
+    from day_11 import process
+
+    def run(monkeys: process.Monkeys, rounds: int, is_worry_manageable: bool) -> int:
+        monkey_iter = process.monkey_insp(monkeys, is_worry_manageable)
+        for _ in range(rounds):
+            next(monkey_iter)
+        return monkeys.biz
+
+    return Solver(
+        parse=lambda txt: (
+            process.parse_notes(txt.strip()),
+            process.parse_notes(txt.strip()),
+        ),
+        part_1=lambda monkeys: run(monkeys[0], 20, is_worry_manageable=True),
+        part_2=lambda monkeys: run(monkeys[1], 10_000, is_worry_manageable=False),
+    )
+
+
+def _solver_day_12() -> Solver:
+    from day_12 import process
+
+    return Solver(
+        parse=lambda txt: process.HillClimbing(txt.strip()),
+        part_1=process.HillClimbing.shortest_path_length,
+        part_2=process.HillClimbing.shortest_path_length_from_any_elevation_a,
+    )
+
+
+def _solver_day_13() -> Solver:
+    from day_13 import process
+
+    return Solver(
+        parse=lambda txt: process.DistressSignal(txt.strip()),
+        part_1=process.DistressSignal.sum_valid_pair_idx,
+        part_2=process.DistressSignal.find_decoder_key,
+    )
+
+
+def _solver_day_14() -> Solver:
+    from day_14 import process
+
+    def run(rr: process.RegolithReservoir) -> int:
+        for _ in rr:
+            pass
+        return rr.resting_sand
+
+    return Solver(
+        parse=lambda txt: (
+            process.RegolithReservoir(txt.strip()),
+            process.RegolithReservoir(txt.strip(), floor=True),
+        ),
+        part_1=lambda rrs: run(rrs[0]),
+        part_2=lambda rrs: run(rrs[1]),
+    )
+
+
+def _solver_day_15() -> Solver:
+    from day_15 import process
+
+    return Solver(
+        parse=lambda txt: process.parse_reading_input(txt.strip()),
+        part_1=lambda readings: process.sum_positions_without_beacon(
+            readings, 2_000_000
+        ),
+        part_2=lambda readings: process.missing_beacon_tuning_freq(
+            readings, start=0, end=4_000_000
+        ),
+    )
+
+
+def _solver_day_16() -> Solver:
+    from day_16 import process, process2
+
+    return Solver(
+        parse=lambda txt: (
+            process.ProboscideaVolcanium(txt),
+            process2.ProboscideaVolcanium(txt),
+        ),
+        part_1=lambda pvs: pvs[0].get_max_pressure(),
+        part_2=lambda pvs: pvs[1].get_max_pressure_2(),
+    )
+
+
+def _solver_day_17() -> Solver:
+    from day_17 import process
+
+    def run(pf: process.PyroclasticFlow, rocks: int) -> int:
+        pf_it = iter(pf)
+        for _ in range(rocks):
+            next(pf_it)
+        return pf.tower_height
+
+    return Solver(
+        parse=lambda txt: (
+            process.PyroclasticFlow(txt.strip()),
+            process.PyroclasticFlow(txt.strip()),
+        ),
+        part_1=lambda pfs: run(pfs[0], 2022),
+        part_2=lambda pfs: pfs[1].get_tower_height_after_large_value(
+            1_000_000_000_000
+        ),
+    )
+
+
+def _solver_day_18() -> Solver:
+    from day_18 import process
+
+    return Solver(
+        parse=process.BoilingBoulders,
+        part_1=process.BoilingBoulders.calculate_surface_area,
+        part_2=process.BoilingBoulders.calculate_external_surface_area,
+    )
+
+
+def _solver_day_19() -> Solver:
+    from day_19 import process
+
+    return Solver(
+        parse=process.NotEnoughMaterials,
+        part_1=process.NotEnoughMaterials.find_quality_level,
+        part_2=process.NotEnoughMaterials.first_three,
+    )
+
+
+def _solver_day_20() -> Solver:
+    from day_20 import process, process_other
+
+    def run(gps: Any) -> int:
+        for _ in gps:
+            pass
+        return gps.get_key_nos()
+
+    return Solver(
+        parse=lambda txt: (
+            process.GrovePositioningSystem(txt),
+            process_other.GrovePositioningSystem(
+                txt, apply_decryption_key=True, mix_number=10
+            ),
+        ),
+        part_1=lambda gpss: run(gpss[0]),
+        part_2=lambda gpss: run(gpss[1]),
+    )
+
+
+def _solver_day_21() -> Solver:
+    from day_21 import process
+
+    return Solver(
+        parse=process.MonkeyMath,
+        part_1=process.MonkeyMath.calculate_root,
+        part_2=process.MonkeyMath.calculate_root_equality_test,
+    )
+
+
+def _solver_day_22() -> Solver:
+    from day_22 import process, process_2
+
+    def run(mm: Any) -> int:
+        for _ in mm:
+            pass
+        return mm.password
+
+    return Solver(
+        parse=lambda txt: (
+            process.MonkeyMap(txt),
+            process_2.MonkeyMap(txt, face_size=50),
+        ),
+        part_1=lambda mms: run(mms[0]),
+        part_2=lambda mms: run(mms[1]),
+    )
+
+
+def _solver_day_23() -> Solver:
+    from day_23 import process
+
+    def run_rounds(ud: process.UnstableDiffusion, rounds: int) -> int:
+        ud_it = iter(ud)
+        for _ in range(rounds):
+            next(ud_it)
+        return ud.sum_empty_ground_tiles()
+
+    return Solver(
+        parse=lambda txt: (
+            process.UnstableDiffusion(txt),
+            process.UnstableDiffusion(txt),
+        ),
+        part_1=lambda uds: run_rounds(uds[0], 10),
+        part_2=lambda uds: _exhaust(iter(uds[1])),
+    )
+
+
+def _solver_day_24() -> Solver:
+    from day_24 import process
+
+    def run(bb: process.BlizzardBasin) -> int:
+        _, minute = _exhaust(iter(bb))
+        return minute
+
+    return Solver(
+        parse=lambda txt: (
+            process.BlizzardBasin(txt, round_trip=False),
+            process.BlizzardBasin(txt, round_trip=True),
+        ),
+        part_1=lambda bbs: run(bbs[0]),
+        part_2=lambda bbs: run(bbs[1]),
+    )
+
+
+def _solver_day_25() -> Solver:
+    from day_25 import process
+
+    return Solver(
+        parse=str,
+        part_1=process.calc_fuel_requirement,
+    )
+
+
+SOLVERS: dict[int, Callable[[], Solver]] = {
+    int(name.removeprefix("_solver_day_")): solver_fn
+    for name, solver_fn in list(globals().items())
+    if name.startswith("_solver_day_")
+}
+
+
+def find_solver(day: int) -> Solver:
+    try:
+        solver_fn = SOLVERS[day]
+    except KeyError as exc:
+        raise ValueError(f"No solver registered for day {day}") from exc
+    return solver_fn()
+
+
+def read_input(day: int) -> str:
+    with open(DAYS_DIR / f"day_{day:02}" / "input.txt") as f:
+        return f.read()
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def summarise(samples: list[float]) -> dict[str, float]:
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "p95": _percentile(samples, 95),
+    }
+
+
+def _phases(solver: Solver) -> Iterator[tuple[str, Callable[[Any], Any]]]:
+    for phase in PHASES[1:]:
+        phase_fn = getattr(solver, phase)
+        if phase_fn is not None:
+            yield phase, phase_fn
+
+
+def _time_run(solver: Solver, input_txt: str) -> tuple[dict[str, float], dict[str, Any]]:
+    timings = {}
+    answers = {}
+
+    start = time.perf_counter()
+    parsed = solver.parse(input_txt)
+    timings["parse"] = time.perf_counter() - start
+
+    for phase, phase_fn in _phases(solver):
+        start = time.perf_counter()
+        answers[phase] = phase_fn(parsed)
+        timings[phase] = time.perf_counter() - start
+
+    return timings, answers
+
+
+def _trace_peak_memory(solver: Solver, input_txt: str) -> dict[str, int]:
+    """
+    Peak memory allocated by each phase, in bytes.
+
+    Measured on a separate run because tracemalloc slows down allocation-heavy
+    code too much for the timings to be meaningful.
+    """
+    peaks = {}
+    tracemalloc.start()
+    try:
+        parsed = solver.parse(input_txt)
+        peaks["parse"] = tracemalloc.get_traced_memory()[1]
+        for phase, phase_fn in _phases(solver):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            phase_fn(parsed)
+            peaks[phase] = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def run_day(
+    day: int, input_txt: str, repeat: int = 5, trace_memory: bool = True
+) -> dict[str, dict[str, Any]]:
+    """
+    Time each phase of a day's solver over ``repeat`` runs.
+
+    The input is re-parsed on every run, as several solvers mutate their state
+    while solving.
+    """
+    solver = find_solver(day)
+
+    samples: dict[str, list[float]] = {}
+    answers: dict[str, Any] = {}
+    for _ in range(repeat):
+        timings, answers = _time_run(solver, input_txt)
+        for phase, timing in timings.items():
+            samples.setdefault(phase, []).append(timing)
+
+    peaks = _trace_peak_memory(solver, input_txt) if trace_memory else {}
+
+    results: dict[str, dict[str, Any]] = {}
+    for phase, phase_samples in samples.items():
+        results[phase] = summarise(phase_samples)
+        if phase in peaks:
+            results[phase]["peak_memory"] = peaks[phase]
+        if phase in answers:
+            results[phase]["answer"] = str(answers[phase])
+    return results
+
+
+def available_days() -> list[int]:
+    return [
+        day
+        for day in sorted(SOLVERS)
+        if (DAYS_DIR / f"day_{day:02}" / "input.txt").exists()
+    ]
+
+
+def _format_results(day: int, results: dict[str, dict[str, Any]]) -> str:
+    lines = [f"Day {day:02}"]
+    for phase, result in results.items():
+        line = (
+            f"  {phase:<7}"
+            f" min {result['min'] * 1000:10.3f} ms"
+            f" | median {result['median'] * 1000:10.3f} ms"
+            f" | p95 {result['p95'] * 1000:10.3f} ms"
+        )
+        if "peak_memory" in result:
+            line += f" | peak {result['peak_memory'] / 1024:10.1f} KiB"
+        if "answer" in result:
+            line += f" | {result['answer']!r}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "days",
+        nargs="*",
+        type=int,
+        help="days to run (default: every day with an input.txt)",
+    )
+    parser.add_argument(
+        "-n", "--repeat", type=int, default=5, help="repetitions per day"
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the peak memory run"
+    )
+    parser.add_argument("--json", type=pathlib.Path, help="export results to a file")
+    args = parser.parse_args(argv)
+
+    days = args.days or available_days()
+    all_results = {}
+    for day in days:
+        results = run_day(
+            day, read_input(day), repeat=args.repeat, trace_memory=not args.no_memory
+        )
+        all_results[str(day)] = results
+        print(_format_results(day, results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"repeat": args.repeat, "days": all_results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import pytest
+
+import benchmark
+import generators
+
+
+@pytest.mark.parametrize("day", sorted(generators.GENERATORS))
+def test_generate_is_seeded(day: int) -> None:
+    assert generators.generate(day, 1, seed=1) == generators.generate(day, 1, seed=1)
+    assert generators.generate(day, 1, seed=1) != generators.generate(day, 1, seed=2)
+
+
+def test_generate_unknown_day() -> None:
+    with pytest.raises(ValueError):
+        generators.generate(26, 1)
+
+
+@pytest.mark.parametrize(
+    "measurements, exponent",
+    [
+        ([2.0, 20.0, 200.0], 1.0),
+        ([2.0, 200.0, 20_000.0], 2.0),
+        ([5.0, 5.0, 5.0], 0.0),
+    ],
+)
+def test_growth_exponent(measurements: list[float], exponent: float) -> None:
+    assert benchmark.growth_exponent([1, 10, 100], measurements) == pytest.approx(
+        exponent
+    )
+
+
+def test_growth_exponent_single_point() -> None:
+    assert benchmark.growth_exponent([1], [2.0]) is None
+
+
+def test_compare_with_baseline() -> None:
+    baseline = {"scales": [1, 10, 100], "time_exponent": 1.0, "memory_exponent": 1.0}
+    assert benchmark.compare_with_baseline(
+        {"scales": [1, 10, 100], "time_exponent": 1.2, "memory_exponent": 0.5},
+        baseline,
+        tolerance=0.25,
+    ) == []
+    assert benchmark.compare_with_baseline(
+        {"scales": [1, 10], "time_exponent": 2.0, "memory_exponent": 1.0},
+        baseline,
+        tolerance=0.25,
+    ) == [
+        "only reached scale 10 within budget (baseline: 100)",
+        "time grows as scale^2.00 (baseline: scale^1.00)",
+    ]
+
+
+@pytest.mark.parametrize(
+    "scales, tolerance",
+    [
+        ([1, 10, 100, 1000], 0.25),
+        ([1, 10, 100], 0.25 * 2.5**0.5),
+        ([1, 10], 0.25 * 10**0.5),
+        ([1], float("inf")),
+    ],
+)
+def test_exponent_tolerance(scales: list[int], tolerance: float) -> None:
+    assert benchmark.exponent_tolerance(scales, 0.25) == pytest.approx(tolerance)
+
+
+def test_compare_with_baseline_two_scales() -> None:
+    baseline = {"scales": [1, 10], "time_exponent": 2.1, "memory_exponent": 1.0}
+    assert benchmark.compare_with_baseline(
+        {"scales": [1, 10], "time_exponent": 2.6, "memory_exponent": 1.0},
+        baseline,
+        tolerance=0.25,
+    ) == []
+    assert benchmark.compare_with_baseline(
+        {"scales": [1, 10], "time_exponent": 3.1, "memory_exponent": 1.0},
+        baseline,
+        tolerance=0.25,
+    ) == ["time grows as scale^3.10 (baseline: scale^2.10)"]
+
+
+def test_compare_with_baseline_without_growth() -> None:
+    baseline = {"scales": [1], "time_exponent": None, "memory_exponent": None}
+    assert benchmark.compare_with_baseline(
+        {"scales": [1, 10], "time_exponent": 1.0, "memory_exponent": 1.0},
+        baseline,
+        tolerance=0.25,
+    ) == [
+        "no time growth in the baseline to compare with",
+        "no memory growth in the baseline to compare with",
+    ]
+    assert benchmark.compare_with_baseline(
+        {"scales": [1], "time_exponent": None, "memory_exponent": None},
+        {"scales": [1, 10], "time_exponent": 1.0, "memory_exponent": 1.0},
+        tolerance=0.25,
+    ) == [
+        "only reached scale 1 within budget (baseline: 10)",
+        "time growth not measured",
+        "memory growth not measured",
+    ]
+
+
+def test_main_without_baseline(tmp_path) -> None:
+    assert benchmark.main(
+        ["1", "--scales", "1", "4", "-n", "1", "--baseline", str(tmp_path / "x.json")]
+    ) == 1
+
+
+def test_benchmark_day_budget() -> None:
+    result = benchmark.benchmark_day(1, scales=(1, 4), repeat=1, budget=0)
+    assert result["scales"] == [1]
+
+
+def test_benchmark_day() -> None:
+    result = benchmark.benchmark_day(1, scales=(1, 4), repeat=1)
+    assert result["scales"] == [1, 4]
+    assert len(result["time"]) == len(result["memory"]) == 2
+    assert result["time_exponent"] is not None
+    assert result["memory_exponent"] == pytest.approx(1.0, abs=0.25)
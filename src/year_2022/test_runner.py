@@ -0,0 +1,65 @@
+import pytest
+
+import runner
+
+
+def test_summarise() -> None:
+    samples = [float(sample) for sample in range(1, 101)]
+    assert runner.summarise(samples) == {"min": 1.0, "median": 50.5, "p95": 95.0}
+
+
+def test_summarise_single_sample() -> None:
+    assert runner.summarise([2.0]) == {"min": 2.0, "median": 2.0, "p95": 2.0}
+
+
+def test_find_solver_unknown_day() -> None:
+    with pytest.raises(ValueError):
+        runner.find_solver(26)
+
+
+def test_run_day() -> None:
+    inventory_input = """\
+1000
+2000
+3000
+
+4000
+
+5000
+6000
+
+7000
+8000
+9000
+
+10000
+"""
+    results = runner.run_day(1, inventory_input, repeat=3)
+    assert list(results) == ["parse", "part_1", "part_2"]
+    assert results["part_1"]["answer"] == "24000"
+    assert results["part_2"]["answer"] == "45000"
+    for result in results.values():
+        assert 0 <= result["min"] <= result["median"] <= result["p95"]
+        assert result["peak_memory"] >= 0
+
+
+def test_run_day_without_part_2() -> None:
+    fuel_reqs = """\
+1=-0-2
+12111
+2=0=
+21
+2=01
+111
+20012
+112
+1=-1=
+1-12
+12
+1=
+122
+"""
+    results = runner.run_day(25, fuel_reqs, repeat=1, trace_memory=False)
+    assert list(results) == ["parse", "part_1"]
+    assert results["part_1"]["answer"] == "2=-1=0"
+    assert "peak_memory" not in results["part_1"]